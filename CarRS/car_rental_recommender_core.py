@@ -1,12 +1,30 @@
 import os
 import time
+import atexit
+import copy
+import functools
+import hashlib
+import heapq
+import threading
 import pandas as pd
 import numpy as np
-import requests
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 import re
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from itertools import chain, islice
+from operator import itemgetter
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; plain NumPy is used without it
+    njit = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
 
 # Region and provider constants: Singapore vs Malaysia categories kept separate
 VALID_REGIONS = ("Singapore", "Malaysia")
@@ -18,6 +36,53 @@ REQUIRED_COLUMNS = ["Date"]  # Minimum required for pipeline to run
 RECOMMENDED_COLUMNS = ["Car model", "Car Cat", "Distance (KM)", "Rental hour", "Total"]
 DEDUP_KEY_COLUMNS = ["Date", "Car model", "Car Cat", "Distance (KM)", "Rental hour"]
 
+# Ollama server endpoint
+OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
+OLLAMA_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Historical provider statistics and their prompt text, keyed by data-set signature.
+# They only change when the data set does, so repeated prompts reuse them; in-place
+# edits keep the signature, so callers clear_historical_prompt_cache() after editing.
+HISTORICAL_PROMPT_CACHE_SIZE = 8
+_historical_prompt_cache = OrderedDict()
+_historical_prompt_cache_lock = threading.Lock()
+_historical_prompt_cache_generation = 0
+
+# Shared keep-alive session for Ollama HTTP calls (created on first use)
+_ollama_session = None
+_ollama_session_lock = threading.Lock()
+
+# How long Ollama keeps a model loaded after a request; avoids multi-second reloads
+# between recommendation calls. Override with the OLLAMA_KEEP_ALIVE environment variable.
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
+# Token budget for JSON-mode replies (a recommendation payload is well under 300 tokens)
+OLLAMA_JSON_NUM_PREDICT = 400
+
+# Method tag of recommendations made up when an Ollama reply could not be parsed
+_OLLAMA_FALLBACK_METHOD = "Ollama Analysis (Fallback)"
+
+# Exact-prompt response cache: (prompt digest, model, temperature) -> (stored at, text).
+# Only replies the caller could parse are stored (see call_ollama_api's cacheable), and
+# sampling above OLLAMA_CACHE_MAX_TEMPERATURE is meant to vary, so it is never cached.
+OLLAMA_CACHE_SIZE = 512
+OLLAMA_CACHE_MAX_TEMPERATURE = 0.5
+OLLAMA_CACHE_TTL = 3600  # seconds
+_ollama_response_cache = OrderedDict()
+_ollama_cache_lock = threading.Lock()
+
+# Result cache for get_ollama_enhanced_recommendations, keyed on the exact trip and
+# inputs. clear_recommendation_cache() bumps the generation, so results computed from
+# data that changed mid-call are stored under a key that is never looked up again.
+RECOMMENDATION_CACHE_TTL = 3600  # seconds
+# use_ollama="auto" skips Ollama when each top historical pick rests on at least
+# this many recorded trips of its provider and car model
+AUTO_OLLAMA_MIN_TRIPS = 5
+RECOMMENDATION_CACHE_SIZE = 256
+_recommendation_cache = OrderedDict()
+_recommendation_cache_lock = threading.Lock()
+_recommendation_cache_generation = 0
+
 
 def validate_schema(df: pd.DataFrame) -> tuple:
     """
@@ -157,13 +222,14 @@ def ensure_region_column(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def load_data(file_path):
+def load_data(file_path, nrows=None):
     """Load and validate data from CSV file. Ensures Region column exists and is normalized.
-    Used by run_cleaning_pipeline(); for full cleaning use run_cleaning_pipeline() instead."""
+    Used by run_cleaning_pipeline(); for full cleaning use run_cleaning_pipeline() instead.
+    nrows limits the read to the first rows of the file (e.g. for a preview)."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Data file not found: {file_path}")
 
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, nrows=nrows)
     df = ensure_region_column(df)
     print(f"Loaded {len(df)} records from {file_path}")
     return df
@@ -1002,6 +1068,7 @@ def create_fallback_recommendations(distance, duration, is_weekend=False):
     """Create fallback recommendations when no data is available"""
     providers = ["Getgo", "Car Club", "Econ", "Stand"]
     recommendations = []
+    weekend_mul = 1.2 if is_weekend else 1.0  # Weekend surcharge
 
     for provider in providers:
         if provider in ["Getgo", "Car Club"]:
@@ -1010,17 +1077,13 @@ def create_fallback_recommendations(distance, duration, is_weekend=False):
             hourly_rate = 8.0
             mileage_cost = distance * mileage_rate
             duration_cost = duration * hourly_rate
-            total_cost = mileage_cost + duration_cost
+            total_cost = (mileage_cost + duration_cost) * weekend_mul
         else:
             # Per hour + fuel cost
             hourly_rate = 15.0
             duration_cost = duration * hourly_rate
             fuel_cost = (distance / 110) * 20 if distance > 0 else 0
-            total_cost = duration_cost + fuel_cost
-
-        # Weekend surcharge
-        if is_weekend:
-            total_cost *= 1.2
+            total_cost = (duration_cost + fuel_cost) * weekend_mul
 
         recommendations.append(
             {
@@ -1073,19 +1136,96 @@ def create_ollama_recommendations(
         # Create the prompt for Ollama
         prompt = create_ollama_prompt(context_data)
 
-        # Call Ollama API
-        response = call_ollama_api(prompt, model_name)
+        # Call Ollama API (stop reading once the JSON array is complete)
+        response = call_ollama_api(
+            prompt, model_name, json_mode=True,
+            cacheable=lambda text: bool(_parse_ollama_json(text)),
+        )
 
-        # Parse the response
-        recommendations = parse_ollama_response(response, context_data)
+        # Parse the response; only the recommendations kept become dicts
+        recommendations = _parse_ollama_recommendations(response, context_data)
 
-        return recommendations[:top_n]
+        return [rec.to_dict() for rec in recommendations[:top_n]]
 
     except Exception as e:
         print(f"Ollama recommendation error: {e}")
         return []
 
 
+def create_ollama_recommendations_batch(scenarios, df, top_n=5, model_name="llama2"):
+    """
+    Get Ollama recommendations for several trips with a single prompt.
+
+    The historical-data section is sent once for all scenarios instead of once per
+    trip, which cuts prompt processing roughly by the number of scenarios.
+
+    Args:
+        scenarios: Iterable of (distance, duration, is_weekend) tuples
+        df: Historical rental data
+        top_n: Number of recommendations per scenario
+        model_name: Ollama model to use
+
+    Returns:
+        List of recommendation lists, one per scenario, in input order
+    """
+    scenarios = list(scenarios)
+    if not scenarios:
+        return []
+
+    try:
+        historical_data, historical_summary = _historical_prompt_section(df)
+        prompt = create_ollama_batch_prompt(historical_data, scenarios, historical_summary)
+        response = call_ollama_api(
+            prompt, model_name, json_mode=True,
+            num_predict=OLLAMA_JSON_NUM_PREDICT * len(scenarios),
+            # Only a reply answering every scenario is worth replaying
+            cacheable=lambda text: _parse_batch_reply(text).keys() >= set(
+                range(1, len(scenarios) + 1)
+            ),
+        )
+    except Exception as e:
+        print(f"Ollama recommendation error: {e}")
+        return [[] for _ in scenarios]
+
+    by_id = _parse_batch_reply(response)
+
+    results = []
+    for scenario_id, (distance, duration, is_weekend) in enumerate(scenarios, 1):
+        recommendations = by_id.get(scenario_id)
+        method = "Ollama Analysis"
+        if recommendations is None:
+            method = _OLLAMA_FALLBACK_METHOD
+            context_data = {
+                "user_request": {
+                    "distance_km": distance,
+                    "duration_hours": duration,
+                    "is_weekend": is_weekend,
+                },
+                "historical_data": historical_data,
+            }
+            recommendations = create_fallback_from_response(response, context_data)
+        try:
+            cleaned = _clean_ollama_recommendations(recommendations, method)
+            results.append([rec.to_dict() for rec in cleaned[:top_n]])
+        except Exception as e:
+            print(f"Error parsing Ollama response: {e}")
+            results.append([])
+    return results
+
+
+def _parse_batch_reply(response):
+    """Map scenario_id -> recommendation dicts from a batch reply ({} if unparseable)"""
+    try:
+        entries = _json_loads(response)["scenarios"]
+        return {
+            int(entry["scenario_id"]): entry.get("recommendations", [])
+            for entry in entries
+            if isinstance(entry, dict) and "scenario_id" in entry
+        }
+    except (ValueError, KeyError, TypeError):
+        return {}
+
+
 def prepare_context_for_ollama(distance, duration, df, is_weekend,
                                 passenger_count=None, space_requirements=None, rental_timing=None):
     """Prepare historical data context for Ollama analysis with range information"""
@@ -1132,6 +1272,43 @@ def prepare_context_for_ollama(distance, duration, df, is_weekend,
                     "popular_models": provider_stats.get("popular_models", {})
                 }
 
+    context["historical_data"], context["historical_summary"] = _historical_prompt_section(df)
+
+    return context
+
+
+def _historical_prompt_section(df):
+    """Return (historical_data, historical_summary) for df, memoized on its signature"""
+    if df is None or df.empty:
+        return {}, ""
+
+    key = (_historical_prompt_cache_generation, id(df), df.shape, df.index.max())
+    with _historical_prompt_cache_lock:
+        cached = _historical_prompt_cache.get(key)
+        if cached is not None:
+            _historical_prompt_cache.move_to_end(key)
+            return cached
+
+    historical_data = summarize_providers_for_ollama(df)
+    section = (historical_data, _format_historical_summary(historical_data))
+    with _historical_prompt_cache_lock:
+        _historical_prompt_cache[key] = section
+        if len(_historical_prompt_cache) > HISTORICAL_PROMPT_CACHE_SIZE:
+            _historical_prompt_cache.popitem(last=False)
+    return section
+
+
+def clear_historical_prompt_cache():
+    """Drop cached historical prompt sections (e.g. after records are edited)"""
+    global _historical_prompt_cache_generation
+    with _historical_prompt_cache_lock:
+        _historical_prompt_cache.clear()
+        _historical_prompt_cache_generation += 1
+
+
+def summarize_providers_for_ollama(df):
+    """Per-provider historical statistics used in every Ollama recommendation prompt"""
+    historical_data = {}
     if df is not None and not df.empty:
         # Group by provider and calculate statistics
         for provider in df["Car Cat"].unique() if "Car Cat" in df.columns else []:
@@ -1160,7 +1337,7 @@ def prepare_context_for_ollama(distance, duration, df, is_weekend,
             # Get popular car models
             car_models = provider_data["Car model"].dropna().value_counts().head(3)
 
-            context["historical_data"][provider] = {
+            historical_data[provider] = {
                 "avg_cost_per_km": (
                     round(avg_cost_per_km, 2) if avg_cost_per_km else None
                 ),
@@ -1179,16 +1356,39 @@ def prepare_context_for_ollama(distance, duration, df, is_weekend,
                 ),
             }
 
-    return context
+    return historical_data
 
 
-def create_ollama_prompt(context_data):
-    """Create a structured prompt for Ollama to analyze car rental recommendations"""
+# Shared guidance for single-trip and batched recommendation prompts
+_OLLAMA_RECOMMENDATION_INSTRUCTIONS = """Instructions:
+- Recommend exactly 3 car rental options based only on providers and models present in the historical data.
+- Focus on: 
+  • Lowest total cost for the requested trip
+  • Provider reliability and popularity
+  • Value for money (cost per km/hour)
+  • Suitability for errands, leisure, or sightseeing
+  • Frequency of rentals (popularity)
+  • Car size suitability for passenger count and space needs (if provided)
+  • Pricing model (mileage-included vs pay-per-km) based on trip distance
+- Exclude any cars not found in the historical data.
+- Consider that for short trips (<50km), mileage-included pricing (Econ, Stand, Tribecar) is usually better.
+- Consider that for long trips (>100km), pay-per-km pricing (Getgo, Car Club) may be more economical."""
 
-    # Format historical data
+_OLLAMA_RECOMMENDATION_FORMAT = """{
+      "provider": "Provider Name",
+      "model": "Car Model",
+      "total_cost": estimated_cost,
+      "reasoning": "Brief explanation of why this is a good value for the customer",
+      "confidence": 0.8,
+      "method": "Ollama Analysis"
+    }"""
+
+
+def _format_historical_summary(historical_data):
+    """Render per-provider historical statistics as the prompt's Historical Data section"""
     historical_summary = ""
-    if context_data["historical_data"]:
-        for provider, data in context_data["historical_data"].items():
+    if historical_data:
+        for provider, data in historical_data.items():
             historical_summary += f"\n{provider}:\n"
             historical_summary += (
                 f"  - Average cost per km: ${data['avg_cost_per_km']}\n"
@@ -1216,6 +1416,16 @@ def create_ollama_prompt(context_data):
                 )
                 historical_summary += f"  - Popular models: {models_str}\n"
 
+    return historical_summary
+
+
+def create_ollama_prompt(context_data):
+    """Create a structured prompt for Ollama to analyze car rental recommendations"""
+
+    historical_summary = context_data.get("historical_summary")
+    if historical_summary is None:
+        historical_summary = _format_historical_summary(context_data["historical_data"])
+
     # Build customer request summary
     customer_request = f"""Customer Request:
 - Distance: {context_data['user_request']['distance_km']} km
@@ -1240,67 +1450,308 @@ def create_ollama_prompt(context_data):
 
 Historical Data:{historical_summary}
 
-Instructions:
-- Recommend exactly 3 car rental options based only on providers and models present in the historical data.
-- Focus on: 
-  • Lowest total cost for the requested trip
-  • Provider reliability and popularity
-  • Value for money (cost per km/hour)
-  • Suitability for errands, leisure, or sightseeing
-  • Frequency of rentals (popularity)
-  • Car size suitability for passenger count and space needs (if provided)
-  • Pricing model (mileage-included vs pay-per-km) based on trip distance
-- Exclude any cars not found in the historical data.
-- Consider that for short trips (<50km), mileage-included pricing (Econ, Stand, Tribecar) is usually better.
-- Consider that for long trips (>100km), pay-per-km pricing (Getgo, Car Club) may be more economical.
-
-Respond with a JSON array in this format:
-[
-  {{
-    "provider": "Provider Name",
-    "model": "Car Model",
-    "total_cost": estimated_cost,
-    "reasoning": "Brief explanation of why this is a good value for the customer",
-    "confidence": 0.8,
-    "method": "Ollama Analysis"
-  }}
-]
-Return only the JSON array, no extra commentary.
+{_OLLAMA_RECOMMENDATION_INSTRUCTIONS}
+
+Respond with a JSON object in this format:
+{{
+  "recommendations": [
+    {_OLLAMA_RECOMMENDATION_FORMAT}
+  ]
+}}
+Return only the JSON object, no extra commentary.
 """
 
     return prompt
 
 
-def call_ollama_api(prompt, model_name="llama2"):
-    """Call Ollama API to get LLM response"""
-    try:
-        url = "http://localhost:11434/api/generate"
+def create_ollama_batch_prompt(historical_data, scenarios, historical_summary=None):
+    """
+    Create one prompt covering several trips so the historical data is sent once.
 
-        payload = {
-            "model": model_name,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.3,  # Lower temperature for more consistent responses
-                "top_p": 0.9,
-                "max_tokens": 1000,
-            },
-        }
+    Args:
+        historical_data: Provider statistics from summarize_providers_for_ollama
+        scenarios: List of (distance, duration, is_weekend) tuples
+        historical_summary: Pre-rendered Historical Data section, if already available
 
-        # Timeout: longer for larger models (they can take 60–120s on CPU)
-        timeout = 45 if "3b" in model_name.lower() else 120
-        response = requests.post(url, json=payload, timeout=timeout)
+    Returns:
+        Prompt asking for {"scenarios": [{"scenario_id", "recommendations"}]}
+    """
+    if historical_summary is None:
+        historical_summary = _format_historical_summary(historical_data)
+    scenario_lines = "\n".join(
+        f"{i}. Distance: {distance} km, Duration: {duration} hours, "
+        f"Weekend: {'Yes' if is_weekend else 'No'}"
+        for i, (distance, duration, is_weekend) in enumerate(scenarios, 1)
+    )
+
+    return f"""You are an expert in car rental recommendations. Your task is to suggest the best value options for a 24-year-old driver with 3 years of experience, prioritizing cost-effectiveness and reliability.
+
+For each of the following {len(scenarios)} customer requests, make an independent recommendation.
+
+Customer Requests:
+{scenario_lines}
+
+Historical Data:{historical_summary}
+
+{_OLLAMA_RECOMMENDATION_INSTRUCTIONS}
+
+Respond with a JSON object in this format, with one entry per customer request:
+{{
+  "scenarios": [
+    {{
+      "scenario_id": 1,
+      "recommendations": [
+        {_OLLAMA_RECOMMENDATION_FORMAT}
+      ]
+    }}
+  ]
+}}
+Return only the JSON object, no extra commentary.
+"""
+
+
+def _json_dumps(obj):
+    """Encode obj as UTF-8 JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data):
+    """Decode JSON from str or bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _build_ollama_generate_payload(
+    prompt, model_name, temperature=0.3, json_mode=False, num_predict=OLLAMA_JSON_NUM_PREDICT
+):
+    """Build the /api/generate request body"""
+    payload = {
+        "model": model_name,
+        "prompt": prompt,
+        "stream": json_mode,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {
+            "temperature": temperature,  # Lower temperature for more consistent responses
+            "top_p": 0.9,
+            "max_tokens": 1000,
+        },
+    }
+    if json_mode:
+        # Constrain sampling to valid JSON and cap generation near the expected payload size
+        payload["format"] = "json"
+        payload["options"]["num_predict"] = num_predict
+    return payload
+
+
+def _ollama_timeout(model_name):
+    """Timeout: longer for larger models (they can take 60–120s on CPU)"""
+    return 45 if "3b" in model_name.lower() else 120
+
+
+def _get_ollama_session():
+    """Return the shared requests.Session, pooling connections to the Ollama server"""
+    global _ollama_session
+    import requests  # Imported lazily: only needed once Ollama is actually used
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    with _ollama_session_lock:
+        if _ollama_session is None:
+            session = requests.Session()
+            # Retry transient failures at the transport layer: refused connections,
+            # a single read timeout, and one-off 5xx replies (POST included)
+            retry = Retry(
+                total=2,
+                read=1,
+                status=1,
+                backoff_factor=0.2,
+                status_forcelist=(500, 502, 503),
+                allowed_methods=None,
+            )
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            atexit.register(session.close)
+            _ollama_session = session
+        return _ollama_session
+
+
+def log_ollama_server_tuning():
+    """Print the Ollama server tuning variables that affect concurrent requests"""
+    num_parallel = os.environ.get("OLLAMA_NUM_PARALLEL")
+    max_loaded = os.environ.get("OLLAMA_MAX_LOADED_MODELS")
+    print(
+        f"Ollama tuning: OLLAMA_NUM_PARALLEL={num_parallel or 'unset (server default)'}, "
+        f"OLLAMA_MAX_LOADED_MODELS={max_loaded or 'unset (server default)'}, "
+        f"keep_alive={OLLAMA_KEEP_ALIVE}"
+    )
+    if not num_parallel or num_parallel == "1":
+        print("Tip: start the server with OLLAMA_NUM_PARALLEL=4 so concurrent requests run in parallel")
+
+
+def preload_ollama_model(model_name="llama2"):
+    """
+    Load model_name into Ollama memory without generating anything.
+
+    An empty prompt makes the server load the model and hold it for keep_alive,
+    so the first real recommendation request does not pay the cold-start cost.
+    Returns True on success; errors are reported, not raised.
+    """
+    try:
+        response = _get_ollama_session().post(
+            OLLAMA_GENERATE_URL,
+            data=_json_dumps({"model": model_name, "keep_alive": OLLAMA_KEEP_ALIVE}),
+            headers=OLLAMA_JSON_HEADERS,
+            timeout=_ollama_timeout(model_name),
+        )
         response.raise_for_status()
+        return True
+    except Exception as e:
+        print(f"Ollama preload of {model_name} failed: {e}")
+        return False
+
 
-        result = response.json()
-        return result.get("response", "")
+def _ollama_request_error(error):
+    """Translate a requests failure into the user-facing Ollama error"""
+    import requests
 
-    except requests.exceptions.ConnectionError:
-        raise Exception(
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return Exception(
             "Cannot connect to Ollama. Please ensure Ollama is running on localhost:11434"
         )
-    except requests.exceptions.Timeout:
-        raise Exception("Ollama request timed out. Please try again.")
+    if isinstance(error, requests.exceptions.Timeout):
+        return Exception("Ollama request timed out. Please try again.")
+    status = error.response.status_code if error.response is not None else None
+    if isinstance(error, requests.exceptions.RetryError) or status == 500:
+        return Exception(
+            "Ollama server error. Try restarting Ollama or using a different model."
+        )
+    if status is not None:
+        return Exception(f"Ollama HTTP error: {status}")
+    return Exception(f"Ollama API error: {error}")
+
+
+def _ollama_cache_key(prompt, model_name, temperature, json_mode=False):
+    """Cache key for an exact prompt, or None when the request should not be cached"""
+    if temperature > OLLAMA_CACHE_MAX_TEMPERATURE:
+        return None
+    digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+    return (digest, model_name, temperature, json_mode)
+
+
+def _ollama_cache_get(key):
+    """Return the fresh cached response for key (marking it recently used), or None"""
+    if key is None:
+        return None
+    with _ollama_cache_lock:
+        entry = _ollama_response_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.time() - stored_at > OLLAMA_CACHE_TTL:
+            del _ollama_response_cache[key]
+            return None
+        _ollama_response_cache.move_to_end(key)
+        return response
+
+
+def _ollama_cache_put(key, response):
+    """Store a non-empty response, evicting the least recently used entry when full"""
+    if key is None or not response:
+        return
+    with _ollama_cache_lock:
+        _ollama_response_cache[key] = (time.time(), response)
+        _ollama_response_cache.move_to_end(key)
+        if len(_ollama_response_cache) > OLLAMA_CACHE_SIZE:
+            _ollama_response_cache.popitem(last=False)
+
+
+def clear_ollama_cache():
+    """Drop all cached Ollama responses"""
+    with _ollama_cache_lock:
+        _ollama_response_cache.clear()
+
+
+def _append_stream_line(line, parts, scanner):
+    """
+    Add one line of a streamed /api/generate reply to parts.
+
+    Returns True when generation is finished: the server sent done, or the
+    scanner (if any) saw the first JSON value close.
+    """
+    if not line:
+        return False
+    chunk = _json_loads(line)
+    piece = chunk.get("response", "")
+    parts.append(piece)
+    if scanner is not None and scanner.feed(piece):
+        return True
+    return bool(chunk.get("done"))
+
+
+def call_ollama_api(
+    prompt, model_name="llama2", temperature=0.3, json_mode=False,
+    num_predict=OLLAMA_JSON_NUM_PREDICT, cacheable=None,
+):
+    """
+    Call Ollama API to get LLM response.
+
+    cacheable, if given, is called with the reply text and decides whether it may be
+    stored; identical prompts are then answered from cache for OLLAMA_CACHE_TTL
+    seconds. Without it (free-text prompts) the cache is not used, so a truncated or
+    unusable reply is never replayed to a retry.
+
+    With json_mode=True Ollama is asked for a JSON object ("format": "json"); the reply
+    is streamed and the connection is closed as soon as that object is complete.
+
+    Requests ask the server to keep the model loaded for OLLAMA_KEEP_ALIVE. For
+    concurrent callers, run the server with OLLAMA_NUM_PARALLEL=4 (and raise
+    OLLAMA_MAX_LOADED_MODELS if several models are used) so requests are not queued.
+    """
+    import requests
+
+    cache_key = None
+    if cacheable is not None:
+        cache_key = _ollama_cache_key(prompt, model_name, temperature, json_mode)
+    cached = _ollama_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        payload = _build_ollama_generate_payload(
+            prompt, model_name, temperature, json_mode, num_predict
+        )
+        response = _get_ollama_session().post(
+            OLLAMA_GENERATE_URL,
+            data=_json_dumps(payload),
+            headers=OLLAMA_JSON_HEADERS,
+            timeout=_ollama_timeout(model_name),
+            stream=json_mode,
+        )
+        response.raise_for_status()
+
+        if json_mode:
+            parts = []
+            scanner = _JsonValueScanner()
+            try:
+                for line in response.iter_lines():
+                    if _append_stream_line(line, parts, scanner):
+                        break
+            finally:
+                response.close()
+            text = "".join(parts)
+        else:
+            result = _json_loads(response.content)
+            text = result.get("response", "")
+        if cache_key is not None and cacheable(text):
+            _ollama_cache_put(cache_key, text)
+        return text
+
+    except requests.exceptions.RequestException as e:
+        raise _ollama_request_error(e)
 
 
 def call_ollama_chat_api(messages, model_name="llama2"):
@@ -1314,6 +1765,8 @@ def call_ollama_chat_api(messages, model_name="llama2"):
     Returns:
         Response text from the assistant
     """
+    import requests
+
     try:
         url = "http://localhost:11434/api/chat"
 
@@ -1321,6 +1774,7 @@ def call_ollama_chat_api(messages, model_name="llama2"):
             "model": model_name,
             "messages": messages,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": 0.2,  # Lower temperature for more consistent JSON responses
                 "top_p": 0.9,
@@ -1330,20 +1784,19 @@ def call_ollama_chat_api(messages, model_name="llama2"):
 
         # Timeout: longer for larger models (they can take 60–120s on CPU)
         timeout = 45 if "3b" in model_name.lower() else 120
-        response = requests.post(url, json=payload, timeout=timeout)
+        response = _get_ollama_session().post(
+            url, data=_json_dumps(payload), headers=OLLAMA_JSON_HEADERS, timeout=timeout
+        )
         response.raise_for_status()
 
-        result = response.json()
+        result = _json_loads(response.content)
         # Chat API returns message object with content
         message = result.get("message", {})
         return message.get("content", "")
 
-    except requests.exceptions.ConnectionError:
-        raise Exception(
-            "Cannot connect to Ollama. Please ensure Ollama is running on localhost:11434"
-        )
-    except requests.exceptions.Timeout:
-        raise Exception("Ollama request timed out. Please try again.")
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        # Transport failures were already retried by the session; the generate API won't fare better
+        raise _ollama_request_error(e)
     except Exception as e:
         # Fallback to generate API if chat API fails
         print(f"Chat API failed, falling back to generate API: {e}")
@@ -1352,85 +1805,146 @@ def call_ollama_chat_api(messages, model_name="llama2"):
         if user_msg:
             return call_ollama_api(user_msg, model_name)
         raise
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 500:
-            raise Exception(
-                "Ollama server error. Try restarting Ollama or using a different model."
-            )
-        else:
-            raise Exception(f"Ollama HTTP error: {e.response.status_code}")
-    except Exception as e:
-        raise Exception(f"Ollama API error: {str(e)}")
+
+
+class _JsonValueScanner:
+    """
+    Incremental bracket-depth scanner that detects when the first JSON array or
+    object is complete. Text can be fed in pieces (e.g. streamed tokens); brackets
+    inside JSON strings are ignored.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, text):
+        """Consume text; return True once the first value has closed"""
+        for char in text:
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                if self.depth:
+                    self.in_string = True
+            elif char in "[{":
+                self.depth += 1
+            elif char in "]}" and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class Recommendation(NamedTuple):
+    """A cleaned LLM recommendation; converted to a dict only when returned to callers"""
+
+    provider: str
+    model: str
+    total_cost: float
+    reasoning: str
+    confidence: float
+    method: str
+
+    def to_dict(self):
+        return self._asdict()
 
 
 def parse_ollama_response(response, context_data):
-    """Parse Ollama response and extract recommendations"""
+    """Parse Ollama's JSON-mode response and extract recommendation dicts"""
+    return [rec.to_dict() for rec in _parse_ollama_recommendations(response, context_data)]
+
+
+def _parse_ollama_recommendations(response, context_data):
+    """Parse Ollama's JSON-mode response into Recommendation tuples"""
+    parsed = _parse_ollama_json(response)
+    if parsed is not None:
+        return list(parsed)
+
+    # Not the expected {"recommendations": [...]} object; the fallback depends on
+    # context_data, so it is computed fresh rather than cached
+    recommendations = create_fallback_from_response(response, context_data)
     try:
-        # Try to extract JSON from the response
-        import re
+        return _clean_ollama_recommendations(recommendations, _OLLAMA_FALLBACK_METHOD)
+    except Exception as e:
+        print(f"Error parsing Ollama response: {e}")
+        return []
 
-        # Look for JSON array in the response
-        json_match = re.search(r"\[.*\]", response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            recommendations = json.loads(json_str)
-        else:
-            # If no JSON found, create fallback recommendations
-            recommendations = create_fallback_from_response(response, context_data)
 
-        # Validate and clean recommendations
-        cleaned_recommendations = []
-        for rec in recommendations:
-            if isinstance(rec, dict) and "provider" in rec and "total_cost" in rec:
-                cleaned_rec = {
-                    "provider": str(rec.get("provider", "Unknown")),
-                    "model": str(rec.get("model", "Standard")),
-                    "total_cost": float(rec.get("total_cost", 0)),
-                    "reasoning": str(rec.get("reasoning", "LLM recommendation")),
-                    "confidence": float(rec.get("confidence", 0.7)),
-                    "method": "Ollama Analysis",
-                }
-                cleaned_recommendations.append(cleaned_rec)
+@functools.lru_cache(maxsize=256)
+def _parse_ollama_json(response):
+    """
+    Parse and clean a JSON-mode response, memoized on the response text.
 
-        return cleaned_recommendations
+    Returns a tuple of Recommendation (immutable, so safe to share between
+    callers) or None when the response is not a valid recommendations object.
+    """
+    try:
+        recommendations = _json_loads(response)["recommendations"]
+    except (ValueError, KeyError, TypeError):
+        return None
 
-    except json.JSONDecodeError:
-        # If JSON parsing fails, create fallback recommendations
-        return create_fallback_from_response(response, context_data)
+    try:
+        return tuple(_clean_ollama_recommendations(recommendations))
     except Exception as e:
         print(f"Error parsing Ollama response: {e}")
-        return []
+        return ()
+
+
+def _clean_ollama_recommendations(recommendations, method="Ollama Analysis"):
+    """Validate and clean recommendation dicts produced by the LLM into Recommendation tuples.
+
+    Args:
+        method: Method tag for every kept recommendation; _OLLAMA_FALLBACK_METHOD
+            marks picks made up by create_fallback_from_response
+    """
+    cleaned_recommendations = []
+    for rec in recommendations:
+        if isinstance(rec, dict) and "provider" in rec and "total_cost" in rec:
+            cleaned_rec = Recommendation(
+                provider=str(rec.get("provider", "Unknown")),
+                model=str(rec.get("model", "Standard")),
+                total_cost=float(rec.get("total_cost", 0)),
+                reasoning=str(rec.get("reasoning", "LLM recommendation")),
+                confidence=float(rec.get("confidence", 0.7)),
+                method=method,
+            )
+            cleaned_recommendations.append(cleaned_rec)
+
+    return cleaned_recommendations
 
 
 def create_fallback_from_response(response, context_data):
     """Create fallback recommendations when JSON parsing fails"""
     recommendations = []
 
-    # Extract provider names from the response
-    providers = (
-        list(context_data["historical_data"].keys())
-        if context_data["historical_data"]
-        else ["Getgo", "Car Club", "Econ", "Stand"]
+    # Providers seen in the historical data, or the default fallback set
+    providers = context_data["historical_data"] or _FALLBACK_PROVIDERS
+
+    # Same estimate for every provider, so compute it once
+    user_request = context_data["user_request"]
+    weekend_mul = 1.2 if user_request["is_weekend"] else 1.0
+    base_cost = round(
+        (20 + user_request["distance_km"] * 0.3 + user_request["duration_hours"] * 8)
+        * weekend_mul,
+        2,
     )
 
     # Create basic recommendations based on available providers
-    for i, provider in enumerate(providers[:3]):  # Top 3 providers
-        base_cost = (
-            20
-            + (context_data["user_request"]["distance_km"] * 0.3)
-            + (context_data["user_request"]["duration_hours"] * 8)
-        )
-        if context_data["user_request"]["is_weekend"]:
-            base_cost *= 1.2
-
+    for provider in islice(providers, 3):  # Top 3 providers
         recommendations.append(
             {
                 "provider": provider,
                 "model": "Standard",
-                "total_cost": round(base_cost, 2),
+                "total_cost": base_cost,
                 "reasoning": f"Based on historical data analysis for {provider}",
                 "confidence": 0.6,
-                "method": "Ollama Analysis (Fallback)",
+                "method": _OLLAMA_FALLBACK_METHOD,
             }
         )
 
@@ -2170,51 +2684,107 @@ CRITICAL: Return ONLY the JSON object above with your estimates. No explanations
         }
 
 
+# Base providers with typical characteristics, stored column-wise so every
+# provider's cost is computed in a single vectorised expression
+_FALLBACK_PROVIDERS = ("Getgo", "Car Club", "Econ", "Stand")
+_FALLBACK_BASE_COST = np.array([18.0, 20.0, 16.0, 22.0])
+_FALLBACK_KM_RATE = np.array([0.35, 0.32, 0.38, 0.30])
+_FALLBACK_HOUR_RATE = np.array([7.5, 8.0, 7.0, 8.5])
+_FALLBACK_REASONING_TIERS = (
+    "Budget-friendly option for cost-conscious customers.",
+    "Balanced cost-quality ratio suitable for mixed usage (errands, leisure, sightseeing).",
+    "Premium option with higher comfort, good for longer trips and multiple activities.",
+)
+
+
+def _score_fallback_costs(base_cost, km_rate, hour_rate, distance, duration, weekend_mul):
+    """Total cost per provider for one trip; JIT-compiled when numba is installed"""
+    return (base_cost + distance * km_rate + duration * hour_rate) * weekend_mul
+
+
+if njit is not None:
+    _score_fallback_costs = njit(cache=True, fastmath=True)(_score_fallback_costs)
+    # Compile (or load from the on-disk cache) now rather than on the first request
+    _score_fallback_costs(
+        _FALLBACK_BASE_COST, _FALLBACK_KM_RATE, _FALLBACK_HOUR_RATE, 0.0, 0.0, 1.0
+    )
+
+
 def create_fallback_recommendations(distance, duration, is_weekend):
     """Create intelligent fallback recommendations when Ollama is unavailable"""
-    recommendations = []
+    weekend_mul = 1.15 if is_weekend else 1.0  # Weekend premium
+    totals = _score_fallback_costs(
+        _FALLBACK_BASE_COST, _FALLBACK_KM_RATE, _FALLBACK_HOUR_RATE,
+        float(distance), float(duration), weekend_mul,
+    )
+
+    # Reasoning tier per provider: budget (<30), balanced (<40), premium
+    tiers = np.select([totals < 30, totals < 40], [0, 1], 2)
+    rounded = np.round(totals, 2)
 
-    # Base providers with typical characteristics
-    providers = [
-        {"name": "Getgo", "base_cost": 18, "km_rate": 0.35, "hour_rate": 7.5},
-        {"name": "Car Club", "base_cost": 20, "km_rate": 0.32, "hour_rate": 8.0},
-        {"name": "Econ", "base_cost": 16, "km_rate": 0.38, "hour_rate": 7.0},
-        {"name": "Stand", "base_cost": 22, "km_rate": 0.30, "hour_rate": 8.5},
+    # Top 3 by total cost
+    return [
+        {
+            "provider": _FALLBACK_PROVIDERS[i],
+            "model": "Standard",
+            "total_cost": float(rounded[i]),
+            "reasoning": (
+                f"Good value for a 24-year-old driver: {_FALLBACK_PROVIDERS[i]} offers competitive pricing. "
+                + _FALLBACK_REASONING_TIERS[tiers[i]]
+            ),
+            "confidence": 0.7,
+            "method": "Intelligent Fallback",
+        }
+        for i in np.argsort(rounded, kind="stable")[:3]
     ]
 
-    # Calculate costs and create recommendations
-    for provider in providers:
-        base_cost = provider["base_cost"]
-        km_cost = distance * provider["km_rate"]
-        hour_cost = duration * provider["hour_rate"]
-        total_cost = base_cost + km_cost + hour_cost
 
-        if is_weekend:
-            total_cost *= 1.15  # Weekend premium
-
-        # Create reasoning based on the customer profile
-        reasoning = f"Good value for a 24-year-old driver: {provider['name']} offers competitive pricing. "
-        if total_cost < 30:
-            reasoning += "Budget-friendly option for cost-conscious customers."
-        elif total_cost < 40:
-            reasoning += "Balanced cost-quality ratio suitable for mixed usage (errands, leisure, sightseeing)."
-        else:
-            reasoning += "Premium option with higher comfort, good for longer trips and multiple activities."
+def _recommendation_cache_key(distance, duration, is_weekend, df, cost_analysis, options):
+    """Key on the exact trip, the data set, the cost analysis contents and options.
 
-        recommendations.append(
-            {
-                "provider": provider["name"],
-                "model": "Standard",
-                "total_cost": round(total_cost, 2),
-                "reasoning": reasoning,
-                "confidence": 0.7,
-                "method": "Intelligent Fallback",
-            }
-        )
+    cost_analysis is keyed by content, so analyses of different regions (or of
+    edited data) never share a result.
+    """
+    return (
+        _recommendation_cache_generation,
+        float(distance),
+        float(duration),
+        bool(is_weekend),
+        id(df),
+        len(df) if df is not None else 0,
+        repr(cost_analysis),
+        repr(options),
+    )
+
+
+def _recommendation_cache_get(key):
+    """Return a copy of a fresh cached result, dropping it if it has expired"""
+    with _recommendation_cache_lock:
+        entry = _recommendation_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, recommendations = entry
+        if time.time() - stored_at > RECOMMENDATION_CACHE_TTL:
+            del _recommendation_cache[key]
+            return None
+        return copy.deepcopy(recommendations)
+
+
+def _recommendation_cache_put(key, recommendations):
+    """Store a copy of recommendations, evicting the oldest entry when full"""
+    with _recommendation_cache_lock:
+        _recommendation_cache[key] = (time.time(), copy.deepcopy(recommendations))
+        _recommendation_cache.move_to_end(key)
+        if len(_recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+            _recommendation_cache.popitem(last=False)
 
-    # Sort by total cost
-    recommendations.sort(key=lambda x: x["total_cost"])
-    return recommendations[:3]  # Return top 3
+
+def clear_recommendation_cache():
+    """Drop all cached recommendation results (e.g. after the data set changes)"""
+    global _recommendation_cache_generation
+    with _recommendation_cache_lock:
+        _recommendation_cache.clear()
+        _recommendation_cache_generation += 1
 
 
 def get_ollama_enhanced_recommendations(
@@ -2231,11 +2801,56 @@ def get_ollama_enhanced_recommendations(
     space_requirements=None,
     rental_timing=None,
     pricing_config=None,
+    use_cache=True,
 ):
-    """Get enhanced recommendations combining traditional, ML, and Ollama approaches"""
+    """
+    Get enhanced recommendations combining traditional, ML, and Ollama approaches.
+
+    use_ollama may be True, False or "auto". "auto" skips the (multi-second) Ollama
+    call when Historical Analysis yields top_n picks that are each backed by at
+    least AUTO_OLLAMA_MIN_TRIPS recorded trips, trading some diversity for latency.
+
+    Results are cached for RECOMMENDATION_CACHE_TTL seconds and reused for the
+    same trip and inputs until clear_recommendation_cache() is called; results that
+    fell back after a failed method are not cached. Pass use_cache=False to force
+    a fresh computation.
+    """
     print(f"Getting recommendations: distance={distance}, duration={duration}, df_size={len(df) if df is not None else 0}, cost_analysis={cost_analysis is not None}")
-    recommendations = []
+    cache_key = None
+    if use_cache:
+        cache_key = _recommendation_cache_key(
+            distance, duration, is_weekend, df, cost_analysis,
+            (top_n, use_ollama, ollama_model, use_ml, passenger_count,
+             space_requirements, rental_timing, pricing_config),
+        )
+        cached = _recommendation_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+    recommendations, used_fallback = _compute_ollama_enhanced_recommendations(
+        distance, duration, df, cost_analysis, is_weekend, top_n, use_ollama,
+        ollama_model, use_ml, passenger_count, space_requirements, rental_timing,
+        pricing_config,
+    )
+    # A fallback reflects a transient failure (e.g. Ollama down); retry next time
+    if cache_key is not None and not used_fallback:
+        _recommendation_cache_put(cache_key, recommendations)
+    return recommendations
+
+
+def _compute_ollama_enhanced_recommendations(
+    distance, duration, df, cost_analysis, is_weekend, top_n, use_ollama,
+    ollama_model, use_ml, passenger_count, space_requirements, rental_timing,
+    pricing_config,
+):
+    """Uncached body of get_ollama_enhanced_recommendations.
+
+    Returns:
+        tuple: (recommendations, used_fallback); used_fallback is True when a
+        requested method failed and fallback recommendations stood in for it
+    """
     method_recommendations = {}
+    used_fallback = False
     
     # Get size requirements if passenger info provided
     size_requirements = None
@@ -2252,6 +2867,18 @@ def get_ollama_enhanced_recommendations(
             rec["confidence"] = 0.8
         method_recommendations["Historical Analysis"] = traditional_recs
 
+        # "auto": the historical picks rest on enough trips that the LLM call is
+        # not worth its latency
+        if use_ollama == "auto":
+            use_ollama = not (
+                len(traditional_recs) >= top_n
+                and all(
+                    cost_analysis[rec["provider"]]["car_models"][rec["model"]].get("count", 0)
+                    >= AUTO_OLLAMA_MIN_TRIPS
+                    for rec in traditional_recs[:top_n]
+                )
+            )
+
     # Get ML recommendations if data is available and ML is enabled
     if use_ml and len(df) >= 10:
         ml_recs = create_ml_recommendations(distance, duration, df, is_weekend, top_n)
@@ -2267,18 +2894,24 @@ def get_ollama_enhanced_recommendations(
                 rental_timing=rental_timing
             )
             method_recommendations["Ollama Analysis"] = ollama_recs
+            # create_ollama_recommendations returns [] on errors and tags picks
+            # made up from an unparseable reply with _OLLAMA_FALLBACK_METHOD
+            used_fallback = not ollama_recs or any(
+                rec["method"] == _OLLAMA_FALLBACK_METHOD for rec in ollama_recs
+            )
         except Exception as e:
+            used_fallback = True
             print(f"Ollama recommendations failed: {e}")
             # Create fallback recommendations with reasoning when Ollama fails
             fallback_recs = create_fallback_recommendations(
                 distance, duration, is_weekend
             )
             for rec in fallback_recs:
-                rec["method"] = "Ollama Analysis (Fallback)"
+                rec["method"] = _OLLAMA_FALLBACK_METHOD
                 rec["reasoning"] = (
                     f"AI analysis unavailable. Based on historical patterns: {rec.get('reasoning', 'Good value option')}"
                 )
-            method_recommendations["Ollama Analysis (Fallback)"] = fallback_recs
+            method_recommendations[_OLLAMA_FALLBACK_METHOD] = fallback_recs
 
     # If no recommendations from any method, create fallback recommendations
     if not method_recommendations:
@@ -2286,8 +2919,11 @@ def get_ollama_enhanced_recommendations(
             distance, duration, is_weekend
         )
         method_recommendations["Fallback"] = fallback_recs
+        used_fallback = True
 
     # Create balanced recommendations by taking top recommendations from each method
+    by_cost = itemgetter("total_cost")
+    method_top_recs = []
     available_methods = list(method_recommendations.keys())
     if available_methods:
         # Calculate how many recommendations to take from each method
@@ -2296,13 +2932,19 @@ def get_ollama_enhanced_recommendations(
         
         for i, method in enumerate(available_methods):
             method_recs = method_recommendations[method]
-            # Take top recommendations from this method
+            # Take top recommendations from this method, ordered by cost
             num_to_take = recs_per_method + (1 if i < remaining_recs else 0)
-            recommendations.extend(method_recs[:num_to_take])
+            method_top_recs.append(sorted(method_recs[:num_to_take], key=by_cost))
 
-    # Filter by size if requirements provided
     if size_requirements:
-        recommendations = filter_recommendations_by_size(recommendations, size_requirements, df)
+        # Size filtering re-ranks by suitability, so restore cost order afterwards
+        recommendations = filter_recommendations_by_size(
+            list(chain.from_iterable(method_top_recs)), size_requirements, df
+        )
+        recommendations = heapq.nsmallest(top_n, recommendations, key=by_cost)
+    else:
+        # Each method's list is cost-sorted: k-way merge and keep the top N
+        recommendations = list(islice(heapq.merge(*method_top_recs, key=by_cost), top_n))
     
     # Add pricing model comparison info
     if pricing_config is None:
@@ -2317,9 +2959,7 @@ def get_ollama_enhanced_recommendations(
         rec["pricing_model"] = "mileage_included" if rec.get("provider") in ["Econ", "Stand", "Tribecar"] else "pay_per_km"
         rec["pricing_comparison"] = pricing_comparison
     
-    # Sort by total cost and return top N
-    recommendations.sort(key=lambda x: x["total_cost"])
-    return recommendations[:top_n]
+    return recommendations, used_fallback
 
 
 def get_calculator_pricing_recommendations(distance, duration, pricing_data, is_weekend=False, top_n=5):
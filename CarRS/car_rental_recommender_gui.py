@@ -1,5 +1,6 @@
 import os
 import sys
+import importlib.util
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -8,11 +9,16 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 import numpy as np
 from datetime import datetime
 import json
+import re
 import threading
 import queue
 import time
 import socket
 import requests
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from contextlib import contextmanager
+from itertools import chain
 
 # Import core logic
 from car_rental_recommender_core import (
@@ -31,6 +37,8 @@ from car_rental_recommender_core import (
     calculate_cost_breakdown,
     get_enhanced_recommendations,
     get_ollama_enhanced_recommendations,
+    clear_recommendation_cache,
+    clear_historical_prompt_cache,
     get_calculator_pricing_recommendations,
     calculate_provider_prices,
     create_ml_budget_prediction,
@@ -58,6 +66,8 @@ from car_rental_recommender_core import (
     parse_rental_description_with_llm,
     estimate_missing_fields_with_llm,
     call_ollama_api,
+    log_ollama_server_tuning,
+    preload_ollama_model,
     # Form validation (core logic, no UI)
     validate_numeric_input,
     validate_date_input,
@@ -65,114 +75,668 @@ from car_rental_recommender_core import (
 )
 from components import LoadingDialog, GUIHelper, OllamaHelper
 
+# Optional streaming Excel writer; pandas' default openpyxl engine otherwise.
+# Only probed for: pandas imports the engine itself when writing.
+_EXCEL_ENGINE = "xlsxwriter" if importlib.util.find_spec("xlsxwriter") else "openpyxl"
+
+# Optional Parquet mirror of cleaned data files, reused while the source is unchanged
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Chat turns kept in conversation_history (oldest are dropped first)
+CHAT_HISTORY_LIMIT = 200
+# Idle delay before pending settings edits are written to settings.json
+SETTINGS_FLUSH_DELAY_MS = 500
+# Typing pause before the Records search box re-filters the table
+SEARCH_DEBOUNCE_MS = 150
+# Pause in record form edits before the derived fields are recalculated
+AUTO_UPDATE_DELAY_MS = 50
+# Timestamp format for chat history and the error/success log
+TIMESTAMP_FORMAT = "%H:%M:%S"
+
+# Shared widget fonts; one tuple object per spec instead of a fresh literal per widget
+_FONT_SMALL = ("Segoe UI", 9)
+_FONT_SMALL_BOLD = ("Segoe UI", 9, "bold")
+_FONT_NORMAL = ("Segoe UI", 10)
+_FONT_NORMAL_BOLD = ("Segoe UI", 10, "bold")
+
+# Cost Comparison chart colours by recommendation method
+_CHART_METHOD_COLORS = {
+    "Ollama Analysis": "#28a745",
+    "ML Prediction": "#4a90e2",
+    "Historical Analysis": "#f39c12",
+}
+_CHART_DEFAULT_COLOR = "#95a5a6"
+_CHART_LEGEND = tuple(_CHART_METHOD_COLORS.items()) + (("Default Pricing", _CHART_DEFAULT_COLOR),)
+
+# Recommendations results tree row backgrounds by tag
+_RESULTS_TREE_TAG_COLORS = {
+    "best": "#e6ffe6",
+    "ollama": "#e6ffe6",
+    "ollama_best": "#b3ffb3",
+    "ml": "#e6f3ff",
+    "ml_best": "#b3d9ff",
+    "historical": "#fff2e6",
+    "historical_best": "#ffd9b3",
+}
+# Row tag by (is best recommendation, method); methods not listed use "best" or no tag
+_RESULTS_TREE_ROW_TAGS = {
+    (False, "Ollama Analysis"): "ollama",
+    (True, "Ollama Analysis"): "ollama_best",
+    (False, "ML Prediction"): "ml",
+    (True, "ML Prediction"): "ml_best",
+    (False, "Historical Analysis"): "historical",
+    (True, "Historical Analysis"): "historical_best",
+}
+# Reasoning shown in the results tree is cut to this many characters
+_RESULTS_REASONING_LIMIT = 50
+_RESULTS_OLLAMA_REASONING_LIMIT = 100
+# Single-axes analysis views whose axes are kept (hidden) while another view is shown,
+# so switching back to one with unchanged data only toggles visibility
+_CACHED_ANALYSIS_VIEWS = frozenset({"provider_comparison", "cost_trends"})
+# Records list rows inserted up front; further pages are appended as the view nears the end
+_RECORDS_TREE_PAGE_ROWS = 200
+
+# Analysis period filters: period key -> start of the window, given "now"
+_PERIOD_STARTS = {
+    "last_month": lambda now: now - pd.DateOffset(months=1),
+    "last_3_months": lambda now: now - pd.DateOffset(months=3),
+    "last_6_months": lambda now: now - pd.DateOffset(months=6),
+    "this_month": lambda now: pd.Timestamp(now.year, now.month, 1),
+    "this_year": lambda now: pd.Timestamp(now.year, 1, 1),
+}
+
+# Per-km mileage charge by provider for the record form's cost estimates; EV trips pay no fuel
+_PROVIDER_RATES = {
+    "Getgo": {"mileage": 0.39, "is_ev": False},
+    "Car Club": {"mileage": 0.33, "is_ev": False},
+    "Getgo(EV)": {"mileage": 0.29, "is_ev": True},
+}
+_DEFAULT_RATE = {"mileage": 0.0, "is_ev": False}
+
+# Tcl helper that inserts many Treeview rows in one call from Python; rows is a
+# flat {iid values ...} list and an empty iid lets the Treeview pick one
+_TREE_INSERT_PROC = """
+proc carrs_tree_insert {tree rows} {
+    foreach {iid values} $rows {
+        if {$iid eq ""} {
+            $tree insert {} end -values $values
+        } else {
+            $tree insert {} end -id $iid -values $values
+        }
+    }
+}
+"""
+
+# Rows per write batch for CSV exports
+_CSV_CHUNK_ROWS = 50_000
+
+# Parquet schema metadata key holding the cache's source stamp and quality report
+_CLEANED_CACHE_KEY = b"carrs_cleaned"
+
+# Fallback chat greeting used when Ollama is unavailable
+_WELCOME_MESSAGE = (
+    "🤖 Hello! I'm your Car Rental Assistant. I can help you find the best car for your trip.\n"
+    "To get started, I need to know a few details about your journey:\n\n"
+    "1. When will you need the car? (e.g., 'tomorrow', 'Jan 15', 'next Monday')\n"
+    "2. How far will you be traveling? (in kilometers)\n"
+    "3. How long will you need the car? (in hours)\n"
+    "4. How many passengers? (number of people)\n"
+    "5. Any special space requirements? (e.g., 'luggage', 'cargo', 'comfortable')\n\n"
+    "Let's start with when you need the car!"
+)
+
+# Chat tips by trip size: a value <= bounds[i] gets tips[i], larger values get the last tip
+_DISTANCE_TIP_BOUNDS = (10, 50)
+_DISTANCE_TIPS = (
+    "\n💡 **Short trip tip:** Perfect for local errands and quick outings!",
+    "\n🚗 **Medium trip tip:** Great for shopping, appointments, or city exploration!",
+    "\n🌅 **Long trip tip:** Ideal for day trips, sightseeing, or visiting nearby areas!",
+)
+_DURATION_TIP_BOUNDS = (2, 8)
+_DURATION_TIPS = (
+    "\n⏰ **Quick rental tip:** Perfect for short errands and quick trips!",
+    "\n🚗 **Half-day rental tip:** Great for shopping, appointments, or leisure activities!",
+    "\n🌅 **Full-day rental tip:** Ideal for sightseeing, long-distance travel, or multiple stops!",
+)
+
+# Word tokenizer for chat keyword matching
+_WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Chat trigger words, matched against the words of the lower-cased message
+_RESTART_WORDS = frozenset({"restart", "new", "again", "reset"})
+_NO_SPACE_WORDS = frozenset({"no", "none", "nothing", "minimal"})
+
+# Follow-up chat intents in precedence order: (intent, trigger words, trigger phrases)
+_CHAT_INTENTS = (
+    (
+        "details",
+        frozenset({
+            "more", "details", "compare", "comparison", "explain", "why",
+            "best", "cheaper", "cheapest", "expensive", "difference",
+        }),
+        (),
+    ),
+    ("help", frozenset({"help", "how", "instructions"}), ("what can you do",)),
+    ("change", frozenset({"change", "edit", "update", "modify"}), ("different trip",)),
+)
+# Trigger word -> precedence rank of its intent, so classifying is one pass over the words
+_INTENT_RANK_BY_WORD = {
+    word: rank
+    for rank, (_, words, _) in enumerate(_CHAT_INTENTS)
+    for word in words
+}
+
+# Offline replies to follow-up questions about shown recommendations, keyed by intent
+_INTENT_REPLIES = {
+    "details": (
+        "If you'd like more details or a comparison of the recommended cars, please specify which car or aspect you're interested in (e.g., 'Compare the top 2', 'Why is Car A best?', or 'Show me more details about Car B')."
+    ),
+    "help": (
+        "You can ask for car recommendations, cost comparisons, or details about specific cars. For example: 'Show me the cheapest option', 'Compare electric vs. hybrid', or 'Tell me more about Car X'."
+    ),
+    "change": (
+        "To update your trip details, just tell me the new distance or duration, and I'll refresh the recommendations."
+    ),
+    None: "Let me know if you want more info, a comparison, or to change your trip details!",
+}
+# Prepended to the "details" reply from the aggregates of the shown recommendations
+_DETAILS_OVERVIEW = (
+    "📋 The {count} options range from ${min:.2f} to ${max:.2f} across {provider_count} "
+    "provider(s); the cheapest is {model} ({provider}).\n\n"
+)
+_NO_CONTEXT_REPLY = (
+    "I'm here to help! You can ask me about car rental recommendations, or start by telling me about your trip (date, distance, duration, passengers, space needs)."
+)
+
+# Recommendation summary closing lines: duration <= bound[i] / cost < bound[i] picks line i
+_SUMMARY_DURATION_BOUNDS = (2, 6)
+_SUMMARY_DURATION_LINES = (
+    "⏰ **Quick trip tip:** Perfect for short errands or quick outings!",
+    "🚗 **Half-day trip:** Great for shopping, appointments, or leisure activities!",
+    "🌅 **Full-day adventure:** Ideal for sightseeing, long-distance travel, or multiple stops!",
+)
+_SUMMARY_COST_BOUNDS = (25, 40)
+_SUMMARY_COST_LINES = (
+    "💵 **Budget-friendly:** Excellent value for money!",
+    "⚖️ **Balanced option:** Good mix of cost and convenience!",
+    "⭐ **Premium choice:** Higher cost but maximum comfort and features!",
+)
+# Confidence / size suitability score >= bound[i] moves up one emoji
+_SUMMARY_SCORE_BOUNDS = (0.6, 0.8)
+_SUMMARY_SCORE_EMOJIS = ("🔴", "🟡", "🟢")
+_SUMMARY_FOOTER = (
+    "💬 You can say 'restart' to get recommendations for a different trip, or ask me anything else!"
+)
+
+# Chat passenger-count patterns, tried in order
+_PASSENGER_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"(\d+)\s*(?:passengers?|people|pax|persons?)",
+        r"(\d+)\s*(?:adults?|guests?)",
+        r"^(\d+)\s*$",
+    )
+)
+
+
+def _results_tree_values(rec):
+    """Return the results tree values tuple for one recommendation."""
+    method = rec.get("method", "Standard")
+    size_info = rec.get("inferred_size", "N/A")
+    if rec.get("size_suitability"):
+        size_info += f" ({rec['size_suitability']:.0%})"
+    reasoning = rec.get("reasoning", "")
+    limit = (
+        _RESULTS_OLLAMA_REASONING_LIMIT
+        if method == "Ollama Analysis"
+        else _RESULTS_REASONING_LIMIT
+    )
+    display_reasoning = reasoning[:limit] + "..." if len(reasoning) > limit else reasoning
+    return (
+        rec["provider"],
+        rec["model"],
+        f"${rec['total_cost']:.2f}",
+        method,
+        f"{rec.get('confidence', 0.8):.1%}",
+        size_info,
+        rec.get("pricing_model", "N/A"),
+        display_reasoning,
+        reasoning,  # full_reasoning, hidden; read back by show_recommendation_details
+    )
+
+
+def _var_float(var, default=0):
+    """Return float(var.get()), or default when the field is empty; reads the Tk var once."""
+    text = var.get()
+    return float(text) if text else default
+
+
+def _estimate_trip_cost(provider, distance, duration_cost, fuel_pumped, fuel_price, fuel_factor):
+    """Mileage + duration + pumped fuel cost of one trip; EV charging is free, so no fuel.
+
+    Args:
+        fuel_factor: Discount multiplier on pumped fuel (see _get_fuel_discount_factor)
+    """
+    rate = _PROVIDER_RATES.get(provider, _DEFAULT_RATE)
+    mileage_cost = distance * rate["mileage"]
+    if rate["is_ev"]:
+        return mileage_cost + duration_cost
+    return mileage_cost + duration_cost + fuel_pumped * fuel_price * fuel_factor
+
+
+def _tree_insert_rows(tree, rows):
+    """Append (iid, values) rows to a ttk.Treeview with a single Tcl call.
+
+    Needs _TREE_INSERT_PROC defined in the tree's interpreter. Tkinter turns
+    the nested tuples into Tcl lists, so values need no quoting.
+    """
+    if rows:
+        tree.tk.call(
+            "carrs_tree_insert",
+            tree,
+            tuple(item for iid, values in rows for item in (iid, tuple(values))),
+        )
+
+
+def _prepare_rental_frame(df):
+    """Return cleaned rental data with Date parsed once and rows in date order.
+
+    Analysis code then never re-parses dates, and period filters can
+    binary-search the sorted Date column.
+    """
+    if "Date" not in df.columns:
+        return df
+    if not pd.api.types.is_datetime64_dtype(df["Date"]):
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df.sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+def _money_labels(values):
+    """Format numbers as "$1.23" chart labels in one vectorised pass.
+
+    Returns:
+        list: One label string per value
+    """
+    return np.char.add("$", np.char.mod("%.2f", np.asarray(values, dtype=float))).tolist()
+
+
+def _cleaned_cache_path(file_path):
+    """Path of the Parquet mirror kept next to a data file."""
+    return os.path.splitext(file_path)[0] + ".parquet.cache"
+
+
+def _source_stamp(file_path):
+    """(mtime_ns, size) of file_path; a cache is valid only for the same stamp."""
+    stat = os.stat(file_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_cleaned_cache(file_path):
+    """Return (df, quality_report) from the Parquet mirror of file_path.
+
+    Returns:
+        tuple or None: None when pyarrow is missing or the mirror is absent,
+        unreadable or was written for a different version of the file
+    """
+    if pq is None:
+        return None
+    cache_path = _cleaned_cache_path(file_path)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        table = pq.read_table(cache_path)
+        meta = json.loads(table.schema.metadata[_CLEANED_CACHE_KEY])
+        if meta["source"] != _source_stamp(file_path):
+            return None
+        return table.to_pandas(), meta["quality_report"]
+    except Exception as e:
+        print(f"Ignoring cleaned data cache {cache_path}: {e}")
+        return None
+
+
+def _write_cleaned_cache(file_path, stamp, df, quality_report):
+    """Mirror the cleaned df of file_path (as of stamp) to Parquet, if pyarrow is available."""
+    if pa is None:
+        return
+    cache_path = _cleaned_cache_path(file_path)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_CLEANED_CACHE_KEY] = json.dumps(
+            {"source": stamp, "quality_report": quality_report}, default=str
+        )
+        pq.write_table(
+            table.replace_schema_metadata(metadata), cache_path, compression="zstd"
+        )
+    except Exception as e:
+        print(f"Could not write cleaned data cache {cache_path}: {e}")
+
+
+def _export_table(df, file_path):
+    """Write df to file_path without the index: Excel for .xlsx, CSV otherwise."""
+    if file_path.lower().endswith(".xlsx"):
+        df.to_excel(file_path, index=False, engine=_EXCEL_ENGINE)
+    else:
+        df.to_csv(file_path, index=False, chunksize=_CSV_CHUNK_ROWS)
+
+
+def _grouped_agg(df, key, spec):
+    """Group df by key and aggregate with spec into a flat frame.
+
+    Args:
+        df (pd.DataFrame): Rows to group
+        key (str | pd.Series): Column name or per-row key Series
+        spec (dict): Column -> aggregation(s), as for DataFrame.agg
+
+    Returns:
+        pd.DataFrame: The key as a column, then one "<column>_<agg>" column per aggregate
+    """
+    keys = df[key] if isinstance(key, str) else key
+    if pd.api.types.is_string_dtype(keys):
+        # Categorical keys group on integer codes instead of hashing each row's string
+        keys = keys.astype("category")
+    result = df.groupby(keys, observed=True).agg(spec).reset_index()
+    _flatten_columns(result)
+    return result
+
+
+def _flatten_columns(df):
+    """Flatten df's (column, agg) MultiIndex columns in place to "column_agg" names."""
+    df.columns = df.columns.map("_".join).str.strip("_")
+
+
+def _text_column(df, column):
+    """Return df[column] as a list of display strings, blank for missing values."""
+    if column not in df.columns:
+        return [""] * len(df)
+    series = df[column]
+    return series.astype(str).where(series.notna(), "").tolist()
+
+
+def _fixed_column(df, column, prefix=""):
+    """Return df[column] formatted to two decimals, blank for missing or non-numeric values."""
+    if column not in df.columns:
+        return [""] * len(df)
+    values = pd.to_numeric(df[column], errors="coerce").tolist()
+    return [f"{prefix}{v:.2f}" if v == v else "" for v in values]
+
+
+def _preview_rows(df):
+    """Format df as display rows: floats to two decimals, blanks for missing values.
+
+    Returns:
+        list: One tuple of strings per row
+    """
+    cells = []
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_float_dtype(series):
+            cells.append(_fixed_column(df, column))
+        else:
+            # Through object so dates read like str(Timestamp), as in the row view
+            cells.append(series.astype(object).astype(str).where(series.notna(), "").tolist())
+    return list(zip(*cells))
+
+
+def _chat_words(msg_lower):
+    """Return the set of words in a lower-cased chat message."""
+    return frozenset(_WORD_PATTERN.findall(msg_lower))
+
+
+def _classify_chat_intent(msg_lower, words):
+    """Return the highest-precedence intent triggered by a message, or None.
+
+    Args:
+        msg_lower (str): Lower-cased message, used for multi-word phrases
+        words (Iterable[str]): Words of the message
+    """
+    ranks = [_INTENT_RANK_BY_WORD[word] for word in words if word in _INTENT_RANK_BY_WORD]
+    ranks.extend(
+        rank
+        for rank, (_, _, phrases) in enumerate(_CHAT_INTENTS)
+        for phrase in phrases
+        if phrase in msg_lower
+    )
+    return _CHAT_INTENTS[min(ranks)][0] if ranks else None
+
+
+def _summarize_recommendations(recommendations):
+    """Collect cost range, providers and method counts in one pass.
+
+    Returns:
+        dict: min, max, cheapest_idx, providers (set) and methods (Counter);
+        min, max and cheapest_idx are None when there are no recommendations
+    """
+    lo = hi = cheapest_idx = None
+    providers = set()
+    methods = Counter()
+    for i, rec in enumerate(recommendations):
+        cost = rec.get("total_cost", 0)
+        if lo is None or cost < lo:
+            lo = cost
+            cheapest_idx = i
+        if hi is None or cost > hi:
+            hi = cost
+        providers.add(rec.get("provider", ""))
+        methods[rec.get("method", "")] += 1
+    return {
+        "min": lo,
+        "max": hi,
+        "cheapest_idx": cheapest_idx,
+        "providers": providers,
+        "methods": methods,
+    }
+
+
+def _unit_table(*groups):
+    """Map every spelling in (label, convert, spellings) groups to (label, convert, rank).
+
+    rank is the group's position; earlier groups take priority in _parse_quantity.
+    """
+    return {
+        spelling: (label, convert, rank)
+        for rank, (label, convert, spellings) in enumerate(groups)
+        for spelling in spellings
+    }
+
+
+def _quantity_pattern(units):
+    """Compile a single number-plus-optional-unit pattern for a unit table."""
+    # Longest spellings first so e.g. "minutes" is not cut short at "mi"
+    alternation = "|".join(sorted(map(re.escape, units), key=len, reverse=True))
+    # A unit may not run into further letters, so "m" does not match "miles", but
+    # digits may follow it as in "3h30m"
+    return re.compile(rf"(?P<num>\d+(?:\.\d+)?)\s*(?:(?P<unit>{alternation})(?![a-z]))?")
+
+
+def _parse_quantity(pattern, units, text, bare_unit, bare_whole=False):
+    """Extract a number and unit from text in one regex scan.
+
+    Unit groups are tried in table order: the first number carrying the
+    highest-priority unit present wins, so a duration reply of "50 miles for
+    3 hours" reads 3 hours. Otherwise the first bare number is read as
+    bare_unit (only if it is the whole text when bare_whole).
+
+    Returns:
+        tuple: (value, unit_label, converted_value), or (None, None, None)
+    """
+    best = best_rank = bare = None
+    for m in pattern.finditer(text):
+        unit = m["unit"]
+        if unit is None:
+            if bare is None:
+                bare = m
+            continue
+        rank = units[unit][2]
+        if best is None or rank < best_rank:
+            best, best_rank = m, rank
+            if rank == 0:
+                break
+    if best is not None:
+        label, convert, _ = units[best["unit"]]
+        value = float(best["num"])
+        return value, label, convert(value)
+    if bare is None or (bare_whole and text.strip() != bare["num"]):
+        return None, None, None
+    label, convert, _ = units[bare_unit]
+    value = float(bare["num"])
+    return value, label, convert(value)
+
+
+# Chat distance/duration units: spelling -> (label, conversion to km / hours)
+_DISTANCE_UNITS = _unit_table(
+    ("km", lambda v: v, ("km", "kms", "kilometer", "kilometers")),
+    ("miles", lambda v: v * 1.60934, ("mi", "mile", "miles")),
+    ("minutes", lambda v: v, ("min", "mins", "minute", "minutes")),
+    ("hours", lambda v: v * 30, ("hr", "hrs", "hour", "hours")),
+)
+_DURATION_UNITS = _unit_table(
+    ("hours", lambda v: v, ("h", "hr", "hrs", "hour", "hours")),
+    ("minutes", lambda v: v / 60, ("m", "min", "mins", "minute", "minutes")),
+    ("days", lambda v: v * 24, ("d", "day", "days")),
+)
+_DISTANCE_PATTERN = _quantity_pattern(_DISTANCE_UNITS)
+_DURATION_PATTERN = _quantity_pattern(_DURATION_UNITS)
+
 
 def set_modern_theme(root):
-    """Set a modern theme for the application"""
-    style = ttk.Style()
+    """Set a modern theme for the application and return its ttk.Style.
+
+    The theme is configured once per Tk root; later calls just return the style.
+    """
+    style = ttk.Style(root)
+    if getattr(root, "_modern_theme_applied", False):
+        return style
+    root._modern_theme_applied = True
     style.theme_use("clam")  # Use clam as base theme
 
     # Configure colors
     style.configure(
-        ".", background="#f0f0f0", foreground="#333333", font=("Segoe UI", 10)
+        ".", background="#f0f0f0", foreground="#333333", font=_FONT_NORMAL
     )
 
     # Configure specific widgets
     style.configure("TFrame", background="#f0f0f0")
-    style.configure("TLabel", background="#f0f0f0", font=("Segoe UI", 10))
+    style.configure("TLabel", background="#f0f0f0", font=_FONT_NORMAL)
     style.configure(
         "TButton",
         background="#0078d7",
         foreground="white",
-        font=("Segoe UI", 10, "bold"),
+        font=_FONT_NORMAL_BOLD,
         padding=5,
     )
-    style.configure("TEntry", fieldbackground="white", font=("Segoe UI", 10), padding=5)
+    style.configure("TEntry", fieldbackground="white", font=_FONT_NORMAL, padding=5)
     style.configure(
-        "Treeview", background="white", fieldbackground="white", font=("Segoe UI", 10)
+        "Treeview", background="white", fieldbackground="white", font=_FONT_NORMAL
     )
-    style.configure("Treeview.Heading", font=("Segoe UI", 10, "bold"))
+    style.configure("Treeview.Heading", font=_FONT_NORMAL_BOLD)
 
     # Configure hover effects
     style.map(
         "TButton", background=[("active", "#005fa3")], foreground=[("active", "white")]
     )
+    return style
+
 
 class CarRentalRecommenderApp:
+
+    # Ollama models offered before the local server has been queried
+    OLLAMA_MODELS = ("llama3.1:3b", "llama2", "llama2:7b", "llama2:13b", "mistral", "codellama", "neural-chat")
+    DEFAULT_OLLAMA_MODEL = OLLAMA_MODELS[0]
+
+    # StringVars created on first access via var() / self.<name>_var, with initial values
+    _VAR_DEFAULTS = {
+        # Used across multiple tabs
+        "cost_per_kwh": "0.45",
+        "fuel_price": "2.51",
+        "fuel_cost": "20",
+        "tank_distance": "110",
+        "getgo_mileage": "0.39",
+        "carclub_mileage": "0.33",
+        # Records management tab
+        "record_date": "",
+        "record_region": "",
+        "record_car_model": "",
+        "record_provider": "",
+        "record_distance": "",
+        "record_hours": "",
+        "record_fuel_pumped": "",
+        "record_fuel_usage": "",
+        "record_weekend": "",
+        "record_total_cost": "",
+        "record_pumped_cost": "",
+        "record_cost_per_km": "",
+        "record_duration_cost": "",
+        "record_kwh_used": "",
+        "record_electricity_cost": "",
+        "search": "",
+        "record_consumption": "",
+        "record_fuel_savings": "",
+        "record_cost_per_hr": "",
+        "record_mileage_cost": "",
+        "record_deposit_rm": "",
+        "record_rental_fee_rm": "",
+        "record_additional_fee_rm": "",
+    }
+
+    def var(self, name):
+        """Return the StringVar for name, creating it with its default on first use."""
+        attr = name + "_var"
+        v = self.__dict__.get(attr)
+        if v is None:
+            v = tk.StringVar(value=self._VAR_DEFAULTS.get(name, ""))
+            setattr(self, attr, v)
+        return v
+
+    def __getattr__(self, attr):
+        # Only reached when normal lookup fails: route declared <name>_var attributes to var()
+        if attr.endswith("_var") and attr[:-4] in self._VAR_DEFAULTS:
+            return self.var(attr[:-4])
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {attr!r}"
+        )
+
     def __init__(self, root):
         self.root = root
+        self.root.tk.eval(_TREE_INSERT_PROC)
+        self.error_display = None  # Created in setup_recommendation_tab
         self.root.title("Car Rental Recommender")
 
-        # Helper to create StringVars in bulk
-        def create_stringvars(names, default=None):
-            d = {}
-            for name in names:
-                if isinstance(default, dict) and name in default:
-                    d[name] = tk.StringVar(value=default[name])
-                elif isinstance(default, str):
-                    d[name] = tk.StringVar(value=default)
-                else:
-                    d[name] = tk.StringVar()
-            return d
-
         # Initialize variables
         self.df = None
         self.cost_analysis = None
+        self._cost_analysis_key = None  # _cost_analysis_cache_key of the data self.cost_analysis was built from
+        self._cost_analysis_generation = 0  # Bumped per _set_cost_analysis; older background builds are dropped
+        self._analysis_chart_key = None  # Inputs of the chart currently drawn on the Data Analysis tab
+        self._records_tree_key = None  # Identity of the data records_tree is showing unfiltered
+        self._records_tree_rows_all = []  # Formatted (iid, values) rows records_tree is listing
+        self._records_tree_loaded = 0  # How many of those rows are inserted so far
+        self._records_tree_unfiltered = False  # Whether those rows are the full, unfiltered list
         self._last_quality_report = None  # Data cleaning pipeline quality report
         self.settings = {}
         self.selected_record = None
         self._updating_fields = False  # Flag to prevent recursive calls in auto_update_fields
+        self._auto_update_after_id = None  # Pending debounced auto_update_fields run
+        self._auto_update_inputs = None  # _record_form_inputs() as auto_update_fields left them
+        self._filter_after_id = None  # Pending debounced filter_records call
         self._updating_fuel_economy = False  # Flag to prevent recursive calls in update_fuel_economy_comparison
         
         # Initialize user profile attributes with defaults (will be loaded from settings if available)
         self.user_age = 25
         self.user_experience_years = 5
 
-        # StringVars used across multiple tabs
-        shared_vars = {
-            "cost_per_kwh_var": "0.45",
-            "fuel_price_var": "2.51",
-            "fuel_cost_var": "20",
-            "tank_distance_var": "110",
-            "getgo_mileage_var": "0.39",
-            "carclub_mileage_var": "0.33",
-        }
-        self.__dict__.update(create_stringvars(shared_vars.keys(), shared_vars))
+        # Shared and Records StringVars (_VAR_DEFAULTS) are created lazily by var()
 
         # Esso Singapore fuel discount: 23% off when enabled and region is Singapore only
         self.apply_esso_sg_discount_var = tk.BooleanVar(value=True)
 
-        # StringVars for records management tab (no default unless specified)
-        record_vars = [
-            "record_date_var",
-            "record_region_var",
-            "record_car_model_var",
-            "record_provider_var",
-            "record_distance_var",
-            "record_hours_var",
-            "record_fuel_pumped_var",
-            "record_fuel_usage_var",
-            "record_weekend_var",
-            "record_total_cost_var",
-            "record_pumped_cost_var",
-            "record_cost_per_km_var",
-            "record_duration_cost_var",
-            "record_kwh_used_var",
-            "record_electricity_cost_var",
-            "search_var",
-            "record_consumption_var",
-            "record_fuel_savings_var",
-            "record_cost_per_hr_var",
-            "record_mileage_cost_var",
-            "record_deposit_rm_var",
-            "record_rental_fee_rm_var",
-            "record_additional_fee_rm_var",
-        ]
-        # Remove duplicates (record_kwh_used_var, record_electricity_cost_var appear twice)
-        record_vars = list(dict.fromkeys(record_vars))
-        self.__dict__.update(create_stringvars(record_vars))
 
-        # Initialize style
-        self.style = ttk.Style()
+        # Apply the theme before any widgets exist so none need restyling
+        self.style = set_modern_theme(root)
 
         # Create main container
         self.main_frame = ttk.Frame(root, padding="10")
@@ -197,6 +761,11 @@ class CarRentalRecommenderApp:
             setattr(self, attr, ttk.Frame(self.notebook))
             self.notebook.add(getattr(self, attr), text=label)
 
+        # Track the visible tab so chat autoscroll can wait until the chat is shown
+        self._current_tab = str(self.recommendation_tab)
+        self._chat_pending_scroll = False
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_notebook_tab_changed, add="+")
+
         # Set up each tab
         self.setup_recommendation_tab()
         self.setup_data_analysis_tab()
@@ -207,11 +776,11 @@ class CarRentalRecommenderApp:
         self.setup_user_preference_tab()
         self.setup_settings_tab()
 
-        # Set modern theme
-        set_modern_theme(root)
-
-        # Load settings
+        # Load settings; later edits are coalesced into one debounced write
+        self._settings_dirty = False
+        self._settings_after_id = None
         self.load_settings()
+        self.apply_esso_sg_discount_var.trace_add("write", self._mark_settings_dirty)
 
         # Set up status bar
         self.status_var = tk.StringVar()
@@ -224,6 +793,7 @@ class CarRentalRecommenderApp:
         default_file = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "22 - Sheet1.csv"
         )
+        self._loading_data = False
         if os.path.exists(default_file):
             # Load data asynchronously without showing dialog on startup
             self.root.after(100, lambda: self.load_data_file(default_file, show_dialog=False))
@@ -309,11 +879,16 @@ class CarRentalRecommenderApp:
         chat_frame = ttk.Frame(left_panel)
         chat_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.chat_display = tk.Text(
-            chat_frame, wrap=tk.WORD, state=tk.DISABLED, font=("Segoe UI", 10),
+            chat_frame, wrap=tk.WORD, state=tk.DISABLED, font=_FONT_NORMAL,
             bg="white", relief=tk.SUNKEN, borderwidth=1
         )
         chat_scrollbar = ttk.Scrollbar(chat_frame, orient=tk.VERTICAL, command=self.chat_display.yview)
         self.chat_display.configure(yscrollcommand=chat_scrollbar.set)
+        # Message tag styles are configured once here; inserts only reference them
+        self.chat_display.tag_configure("bot_name", font=_FONT_NORMAL_BOLD, foreground="#0078d7")
+        self.chat_display.tag_configure("bot_message", foreground="#333333")
+        self.chat_display.tag_configure("user_name", font=_FONT_NORMAL_BOLD, foreground="#28a745")
+        self.chat_display.tag_configure("user_message", foreground="#333333")
         self.chat_display.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         chat_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
@@ -322,7 +897,7 @@ class CarRentalRecommenderApp:
         input_frame.pack(fill=tk.X, padx=5, pady=(5, 0))
         self.message_var = tk.StringVar()
         self.message_entry = ttk.Entry(
-            input_frame, textvariable=self.message_var, font=("Segoe UI", 10), state="normal"
+            input_frame, textvariable=self.message_var, font=_FONT_NORMAL, state="normal"
         )
         self.message_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
         send_button = ttk.Button(
@@ -338,7 +913,7 @@ class CarRentalRecommenderApp:
         # Trip Settings Section
         trip_frame = ttk.Frame(settings_frame)
         trip_frame.pack(fill=tk.X, pady=(0, 5))
-        ttk.Label(trip_frame, text="Trip Settings:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
+        ttk.Label(trip_frame, text="Trip Settings:", font=_FONT_SMALL_BOLD).pack(anchor=tk.W)
         trip_settings_inner = ttk.Frame(trip_frame)
         trip_settings_inner.pack(fill=tk.X, padx=(10, 0), pady=(2, 0))
         
@@ -363,7 +938,7 @@ class CarRentalRecommenderApp:
         # AI Settings Section
         ai_frame = ttk.Frame(settings_frame)
         ai_frame.pack(fill=tk.X, pady=(0, 5))
-        ttk.Label(ai_frame, text="AI Settings:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
+        ttk.Label(ai_frame, text="AI Settings:", font=_FONT_SMALL_BOLD).pack(anchor=tk.W)
         ai_settings_inner = ttk.Frame(ai_frame)
         ai_settings_inner.pack(fill=tk.X, padx=(10, 0), pady=(2, 0))
         
@@ -372,15 +947,15 @@ class CarRentalRecommenderApp:
         
         self.use_ollama_var = tk.BooleanVar(value=False)
         GUIHelper.create_checkbutton(ai_settings_inner, "Use Ollama LLM", self.use_ollama_var)
+        self.use_ollama_var.trace_add("write", self._preload_ollama_if_enabled)
         
         # Ollama model selection with refresh button
         ollama_model_frame = ttk.Frame(ai_settings_inner)
         ollama_model_frame.pack(fill=tk.X, pady=(5, 0))
         ttk.Label(ollama_model_frame, text="Model:").pack(side=tk.LEFT, padx=(10, 2))
-        self.ollama_model_var = tk.StringVar(value="llama3.1:3b")
+        self.ollama_model_var = tk.StringVar(value=self.DEFAULT_OLLAMA_MODEL)
         self.ollama_model_combobox = GUIHelper.create_combobox(
-            ollama_model_frame, self.ollama_model_var,
-            ["llama3.1:3b", "llama2", "llama2:7b", "llama2:13b", "mistral", "codellama", "neural-chat"],
+            ollama_model_frame, self.ollama_model_var, self.OLLAMA_MODELS,
             width=15,
         )
         self.ollama_model_combobox.pack(side=tk.LEFT, padx=(0, 5))
@@ -401,7 +976,7 @@ class CarRentalRecommenderApp:
         # Filter Settings Section (region-aware: Singapore vs Malaysia)
         filter_frame = ttk.Frame(settings_frame)
         filter_frame.pack(fill=tk.X)
-        ttk.Label(filter_frame, text="Filter Settings:", font=("Segoe UI", 9, "bold")).pack(anchor=tk.W)
+        ttk.Label(filter_frame, text="Filter Settings:", font=_FONT_SMALL_BOLD).pack(anchor=tk.W)
         filter_settings_inner = ttk.Frame(filter_frame)
         filter_settings_inner.pack(fill=tk.X, padx=(10, 0), pady=(2, 0))
 
@@ -411,7 +986,7 @@ class CarRentalRecommenderApp:
             filter_settings_inner, self.current_region_var,
             list(VALID_REGIONS), width=12,
         )
-        self.current_region_var.trace_add("write", lambda *a: self._on_region_filter_changed())
+        self.current_region_var.trace_add("write", self._on_region_filter_changed)
 
         ttk.Label(filter_settings_inner, text="Category:").pack(side=tk.LEFT, padx=(0, 2))
         self.car_cat_var = tk.StringVar(value="All")
@@ -421,12 +996,12 @@ class CarRentalRecommenderApp:
         )
         self.recommendation_region_label = ttk.Label(
             filter_frame, text="Showing recommendations for: Singapore",
-            font=("Segoe UI", 9)
+            font=_FONT_SMALL
         )
         self.recommendation_region_label.pack(anchor=tk.W, padx=(10, 0), pady=(2, 0))
 
         # Initialize Ollama model list (will be populated asynchronously)
-        self.available_ollama_models = ["llama3.1:3b", "llama2", "llama2:7b", "llama2:13b", "mistral", "codellama", "neural-chat"]
+        self.available_ollama_models = list(self.OLLAMA_MODELS)
         self.ollama_available = False
 
         # Chat state
@@ -444,8 +1019,9 @@ class CarRentalRecommenderApp:
             "passenger_count": 2,  # Default: 2 passengers (including driver)
             "space_requirements": "little",  # Default: little space
             "conversation_started": False,
-            "conversation_history": [],
+            "conversation_history": deque(maxlen=CHAT_HISTORY_LIMIT),
             "last_recommendations": None,
+            "rec_aggregates": None,
             "user_preferences": {},
             "trip_context": {},
         }
@@ -461,11 +1037,12 @@ class CarRentalRecommenderApp:
         error_display_frame = ttk.Frame(error_frame)
         error_display_frame.pack(fill=tk.BOTH, expand=True)
         self.error_display = tk.Text(
-            error_display_frame, wrap=tk.WORD, state=tk.DISABLED, font=("Segoe UI", 9),
+            error_display_frame, wrap=tk.WORD, state=tk.DISABLED, font=_FONT_SMALL,
             bg="#fff5f5", fg="#d73a49", relief=tk.SUNKEN, borderwidth=1, height=3
         )
         error_scrollbar = ttk.Scrollbar(error_display_frame, orient=tk.VERTICAL, command=self.error_display.yview)
         self.error_display.configure(yscrollcommand=error_scrollbar.set)
+        self.error_display.tag_configure("success", foreground="#28a745")
         clear_error_button = ttk.Button(
             error_display_frame, text="Clear", command=self.clear_error_display, style="Accent.TButton"
         )
@@ -474,49 +1051,47 @@ class CarRentalRecommenderApp:
         clear_error_button.pack(side=tk.RIGHT, padx=(5, 0))
 
         # Results treeview
+        # full_reasoning holds the untruncated text for the details dialog and is never drawn
+        columns_config = [
+            ("provider", "Provider", 80, None),
+            ("car_model", "Car Model", 120, None),
+            ("cost", "Est. Cost ($)", 80, tk.E),
+            ("method", "Method", 100, None),
+            ("confidence", "Confidence", 80, tk.CENTER),
+            ("size", "Size", 90, None),
+            ("pricing_model", "Pricing", 100, None),
+            ("reasoning", "Reasoning", 300, None),
+        ]
+        display_columns = tuple(col for col, _, _, _ in columns_config)
         self.results_tree = ttk.Treeview(
             right_panel,
-            columns=("provider", "car_model", "cost", "method", "confidence", "reasoning", "full_reasoning"),
+            columns=display_columns + ("full_reasoning",),
+            displaycolumns=display_columns,
             show="headings",
         )
-        headings = [
-            ("provider", "Provider"),
-            ("car_model", "Car Model"),
-            ("cost", "Est. Cost ($)"),
-            ("method", "Method"),
-            ("confidence", "Confidence"),
-            ("reasoning", "Reasoning"),
-            ("full_reasoning", ""),
-        ]
-        for col, text in headings:
+        for col, text, width, anchor in columns_config:
             self.results_tree.heading(col, text=text)
-        columns_config = [
-            ("provider", 80, None),
-            ("car_model", 120, None),
-            ("cost", 80, tk.E),
-            ("method", 100, None),
-            ("confidence", 80, tk.CENTER),
-            ("reasoning", 300, None),
-            ("full_reasoning", 0, None),
-        ]
-        for col, width, anchor in columns_config:
             if anchor is not None:
-                self.results_tree.column(col, width=width, anchor=anchor, stretch=(col != "full_reasoning"))
+                self.results_tree.column(col, width=width, anchor=anchor)
             else:
-                self.results_tree.column(col, width=width, stretch=(col != "full_reasoning"))
-        self.results_tree.column("full_reasoning", stretch=False)
+                self.results_tree.column(col, width=width)
         results_scroll = ttk.Scrollbar(right_panel, orient=tk.VERTICAL, command=self.results_tree.yview)
         self.results_tree.configure(yscrollcommand=results_scroll.set)
         self.results_tree.bind("<Double-1>", self.show_recommendation_details)
+        for tag, background in _RESULTS_TREE_TAG_COLORS.items():
+            self.results_tree.tag_configure(tag, background=background)
         results_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Chart
         self.chart_frame = ttk.LabelFrame(right_panel, text="Cost Comparison", padding=(10, 5))
         self.chart_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        self.fig, self.ax = plt.subplots(figsize=(5, 3), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # The figure is created by _ensure_cost_chart on the first recommendation
+        self._chart_ready = False
+        self._chart_placeholder = ttk.Label(
+            self.chart_frame, text="Chart loads on first recommendation", anchor=tk.CENTER
+        )
+        self._chart_placeholder.pack(fill=tk.BOTH, expand=True)
 
         # Data file selection frame
         file_frame = ttk.LabelFrame(right_panel, text="Data Source", padding=5)
@@ -530,7 +1105,7 @@ class CarRentalRecommenderApp:
         file_label = GUIHelper.create_label(file_frame, "Loaded File:")
         file_label.grid(row=0, column=0, sticky=tk.W, padx=(0, 2), pady=2)
         file_name_entry = ttk.Entry(
-            file_frame, textvariable=self.data_file_var, state="readonly", width=24, font=("Segoe UI", 9)
+            file_frame, textvariable=self.data_file_var, state="readonly", width=24, font=_FONT_SMALL
         )
         file_name_entry.grid(row=0, column=1, sticky=tk.W + tk.E, padx=(0, 5), pady=2)
         file_path_entry = ttk.Entry(
@@ -677,6 +1252,21 @@ class CarRentalRecommenderApp:
                 "package_installed": health_check.get("package_installed", False)
             })
     
+    def _preload_ollama_if_enabled(self, *_):
+        """Warm the selected model so the first recommendation skips the load.
+
+        Only runs with "Use Ollama LLM" on: a preloaded model stays resident for
+        OLLAMA_KEEP_ALIVE, which users who never enable Ollama should not pay for.
+        """
+        if not (self.use_ollama_var.get() and self.ollama_available):
+            return
+        log_ollama_server_tuning()
+        threading.Thread(
+            target=preload_ollama_model,
+            args=(self.ollama_model_var.get(),),
+            daemon=True,
+        ).start()
+
     def refresh_ollama_models(self):
         """Refresh the list of available Ollama models"""
         def _refresh_in_thread():
@@ -696,11 +1286,12 @@ class CarRentalRecommenderApp:
                         if current_value in models:
                             self.ollama_model_var.set(current_value)
                         else:
-                            self.ollama_model_var.set(models[0] if models else "llama3.1:3b")
+                            self.ollama_model_var.set(models[0] if models else self.DEFAULT_OLLAMA_MODEL)
                         self.ollama_available = True
                         self.ollama_status_label.config(foreground="green")
                         self.ollama_status_tooltip = "Ollama status: Connected"
                         self.add_success_message(f"Found {len(models)} Ollama model(s)")
+                        self._preload_ollama_if_enabled()
                     else:
                         self.ollama_available = False
                         self.ollama_status_label.config(foreground="red")
@@ -796,6 +1387,38 @@ class CarRentalRecommenderApp:
             print(f"Error preparing dataset context: {e}")
             return ""
     
+    @staticmethod
+    @contextmanager
+    def _text_editable(widget):
+        """Temporarily enable a read-only Text widget for inserts/deletes."""
+        widget["state"] = tk.NORMAL
+        try:
+            yield widget
+        finally:
+            widget["state"] = tk.DISABLED
+
+    def _append_chat(self, name, name_tag, message, message_tag):
+        """Append one speaker line to chat_display in a single insert and scroll to it."""
+        with self._text_editable(self.chat_display) as chat:
+            chat.insert(tk.END, name, name_tag, message + "\n\n", message_tag)
+        if self._current_tab == str(self.recommendation_tab):
+            self.chat_display.see(tk.END)
+        else:
+            # Scrolling forces a layout pass; defer it until the chat tab is visible
+            self._chat_pending_scroll = True
+
+    def _on_notebook_tab_changed(self, event=None):
+        """Record the selected tab and apply any chat autoscroll deferred while hidden."""
+        self._current_tab = self.notebook.select()
+        # The Enter-to-add shortcut is only live while the Records tab is showing
+        if self._current_tab == str(self.records_management_tab):
+            self.root.bind_all("<Return>", self._on_record_form_return)
+        else:
+            self.root.unbind_all("<Return>")
+        if self._chat_pending_scroll and self._current_tab == str(self.recommendation_tab):
+            self._chat_pending_scroll = False
+            self.chat_display.see(tk.END)
+
     def _call_ollama_async(self, messages, model="llama3", callback=None, fallback_message=None, show_loading=False):
         """Helper method to call Ollama asynchronously"""
         loading_positions = {"start": None, "end": None}
@@ -803,21 +1426,16 @@ class CarRentalRecommenderApp:
         def _show_loading():
             """Show loading indicator in chat"""
             if show_loading:
-                self.chat_display.config(state=tk.NORMAL)
                 loading_positions["start"] = self.chat_display.index(tk.END)
-                self.chat_display.insert(tk.END, "🤖 Assistant: ", "bot_name")
-                self.chat_display.insert(tk.END, "Thinking...\n\n", "bot_message")
+                self._append_chat("🤖 Assistant: ", "bot_name", "Thinking...", "bot_message")
                 loading_positions["end"] = self.chat_display.index(tk.END)
-                self.chat_display.config(state=tk.DISABLED)
-                self.chat_display.see(tk.END)
         
         def _remove_loading():
             """Remove loading indicator from chat"""
             if show_loading and loading_positions["start"] and loading_positions["end"]:
                 try:
-                    self.chat_display.config(state=tk.NORMAL)
-                    self.chat_display.delete(loading_positions["start"], loading_positions["end"])
-                    self.chat_display.config(state=tk.DISABLED)
+                    with self._text_editable(self.chat_display) as chat:
+                        chat.delete(loading_positions["start"], loading_positions["end"])
                 except Exception as e:
                     print(f"Error removing loading indicator: {e}")
         
@@ -854,7 +1472,7 @@ class CarRentalRecommenderApp:
         r = self.current_region_var.get() or "Singapore"
         return r if r in VALID_REGIONS else "Singapore"
 
-    def _on_region_filter_changed(self):
+    def _on_region_filter_changed(self, *_):
         """Update category dropdown and region label for the selected region."""
         region = self._get_current_region()
         providers = get_providers_for_region(region)
@@ -868,7 +1486,7 @@ class CarRentalRecommenderApp:
             region = self._get_current_region()
             self.recommendation_region_label.config(text=f"Showing recommendations for: {region}")
 
-    def _update_pref_region_label(self):
+    def _update_pref_region_label(self, *_):
         """Update the User Preference tab region label."""
         if hasattr(self, "pref_region_label"):
             region = self.pref_region_var.get() or "Singapore"
@@ -878,17 +1496,6 @@ class CarRentalRecommenderApp:
 
     def start_chat(self):
         """Initialize the chat conversation using Ollama for the welcome message (async)"""
-        fallback_welcome = (
-            "🤖 Hello! I'm your Car Rental Assistant. I can help you find the best car for your trip.\n"
-            "To get started, I need to know a few details about your journey:\n\n"
-            "1. When will you need the car? (e.g., 'tomorrow', 'Jan 15', 'next Monday')\n"
-            "2. How far will you be traveling? (in kilometers)\n"
-            "3. How long will you need the car? (in hours)\n"
-            "4. How many passengers? (number of people)\n"
-            "5. Any special space requirements? (e.g., 'luggage', 'cargo', 'comfortable')\n\n"
-            "Let's start with when you need the car!"
-        )
-        
         def _on_welcome_received(welcome_message):
             self.add_bot_message(welcome_message, use_ollama=False)
             self.chat_state["waiting_for_timing"] = True
@@ -914,12 +1521,12 @@ class CarRentalRecommenderApp:
                 }],
                 model="llama3",
                 callback=_on_welcome_received,
-                fallback_message=fallback_welcome,
+                fallback_message=_WELCOME_MESSAGE,
                 show_loading=True
             )
         except:
             # If Ollama not available, use fallback immediately
-            _on_welcome_received(fallback_welcome)
+            _on_welcome_received(_WELCOME_MESSAGE)
 
     def add_bot_message(self, message, use_ollama=True):
         """
@@ -928,14 +1535,10 @@ class CarRentalRecommenderApp:
         """
         def _display_message(bot_reply):
             """Display the bot message in chat"""
-            self.chat_display.config(state=tk.NORMAL)
-            self.chat_display.insert(tk.END, "🤖 Assistant: ", "bot_name")
-            self.chat_display.insert(tk.END, bot_reply + "\n\n", "bot_message")
-            self.chat_display.config(state=tk.DISABLED)
-            self.chat_display.see(tk.END)
+            self._append_chat("🤖 Assistant: ", "bot_name", bot_reply, "bot_message")
             
             # Add to conversation history
-            self.chat_state.setdefault("conversation_history", []).append(
+            self.chat_state["conversation_history"].append(
                 {"type": "bot", "message": bot_reply, "timestamp": self.get_current_time()}
             )
         
@@ -994,56 +1597,36 @@ class CarRentalRecommenderApp:
     
     def get_current_time(self):
         """Get current timestamp for conversation history"""
-        import datetime
-
-        return datetime.datetime.now().strftime("%H:%M:%S")
+        return datetime.now().strftime(TIMESTAMP_FORMAT)
 
     def add_error_message(self, error_message):
         """Add an error message to the error display area"""
-        if hasattr(self, "error_display"):
-            self.error_display.config(state=tk.NORMAL)
-            from datetime import datetime
-
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            self.error_display.insert(
-                tk.END, f"[{timestamp}] ❌ {error_message}\n", "error"
-            )
-            self.error_display.config(state=tk.DISABLED)
+        if self.error_display is not None:
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
+            with self._text_editable(self.error_display) as log:
+                log.insert(tk.END, f"[{timestamp}] ❌ {error_message}\n", "error")
             self.error_display.see(tk.END)
 
     def clear_error_display(self):
         """Clear the error display area"""
-        if hasattr(self, "error_display"):
-            self.error_display.config(state=tk.NORMAL)
-            self.error_display.delete(1.0, tk.END)
-            self.error_display.config(state=tk.DISABLED)
+        if self.error_display is not None:
+            with self._text_editable(self.error_display) as log:
+                log.delete(1.0, tk.END)
 
     def add_success_message(self, success_message):
         """Add a success message to the error display area (in green)"""
-        if hasattr(self, "error_display"):
-            self.error_display.config(state=tk.NORMAL)
-            from datetime import datetime
-
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            original_fg = self.error_display.cget("fg")
-            self.error_display.config(fg="#28a745")
-            self.error_display.insert(
-                tk.END, f"[{timestamp}] ✅ {success_message}\n", "success"
-            )
-            self.error_display.config(fg=original_fg)
-            self.error_display.config(state=tk.DISABLED)
+        if self.error_display is not None:
+            timestamp = time.strftime(TIMESTAMP_FORMAT)
+            with self._text_editable(self.error_display) as log:
+                log.insert(tk.END, f"[{timestamp}] ✅ {success_message}\n", "success")
             self.error_display.see(tk.END)
         self.chat_display.see(tk.END)
 
     def add_user_message(self, message):
         """Add a user message to the chat display and update conversation history"""
-        self.chat_display.config(state=tk.NORMAL)
-        self.chat_display.insert(tk.END, "👤 You: ", "user_name")
-        self.chat_display.insert(tk.END, message + "\n\n", "user_message")
-        self.chat_display.config(state=tk.DISABLED)
-        self.chat_display.see(tk.END)
+        self._append_chat("👤 You: ", "user_name", message, "user_message")
         
-        self.chat_state.setdefault("conversation_history", []).append(
+        self.chat_state["conversation_history"].append(
             {"type": "user", "message": message, "timestamp": self.get_current_time()}
         )
 
@@ -1060,9 +1643,11 @@ class CarRentalRecommenderApp:
     def process_message(self, message):
         """Process user message based on current chat state and input"""
         msg_lower = message.lower().strip()
+        # Tokenize once; keyword checks below and in the handlers are set lookups
+        words = _chat_words(msg_lower)
 
         # Check for restart or reset commands first, regardless of state
-        if any(word in msg_lower for word in ["restart", "new", "again", "reset"]):
+        if not _RESTART_WORDS.isdisjoint(words):
             self.restart_conversation()
             return
 
@@ -1070,15 +1655,15 @@ class CarRentalRecommenderApp:
         if self.chat_state.get("waiting_for_timing", False):
             self.handle_rental_timing_input(message)
         elif self.chat_state.get("waiting_for_distance", False):
-            self.handle_distance_input(message)
+            self.handle_distance_input(message, msg_lower)
         elif self.chat_state.get("waiting_for_duration", False):
-            self.handle_duration_input(message)
+            self.handle_duration_input(message, msg_lower)
         elif self.chat_state.get("waiting_for_passengers", False):
-            self.handle_passenger_input(message)
+            self.handle_passenger_input(message, msg_lower)
         elif self.chat_state.get("waiting_for_space", False):
-            self.handle_space_input(message)
+            self.handle_space_input(message, msg_lower, words)
         else:
-            self.handle_contextual_response(message)
+            self.handle_contextual_response(message, msg_lower, words)
 
     def handle_rental_timing_input(self, message):
         """Parse rental date/time input and determine weekday/weekend"""
@@ -1139,20 +1724,15 @@ class CarRentalRecommenderApp:
                 "(e.g., 'tomorrow', 'Jan 15', 'next Monday', or '2024-01-15')."
             )
 
-    def handle_passenger_input(self, message):
+    def handle_passenger_input(self, message, msg_lower=None):
         """Parse passenger count input"""
-        import re
-        
+        if msg_lower is None:
+            msg_lower = message.lower().strip()
+
         # Try to extract number from message
-        patterns = [
-            r"(\d+)\s*(?:passengers?|people|pax|persons?)",
-            r"(\d+)\s*(?:adults?|guests?)",
-            r"^(\d+)\s*$",
-        ]
-        
         passenger_count = None
-        for pattern in patterns:
-            match = re.search(pattern, message.lower())
+        for rx in _PASSENGER_PATTERNS:
+            match = rx.search(msg_lower)
             if match:
                 passenger_count = int(match.group(1))
                 break
@@ -1208,12 +1788,18 @@ class CarRentalRecommenderApp:
                 "(e.g., '2 passengers', '4 people', or just '3')."
             )
 
-    def handle_space_input(self, message):
+    def handle_space_input(self, message, msg_lower=None, words=None):
         """Parse space requirements input"""
-        msg_lower = message.lower().strip()
+        if msg_lower is None:
+            msg_lower = message.lower().strip()
+        if words is None:
+            words = _chat_words(msg_lower)
         
         # Check if user says no space needed
-        if any(word in msg_lower for word in ["no", "none", "nothing", "minimal", "not needed"]):
+        if (
+            not _NO_SPACE_WORDS.isdisjoint(words)
+            or "not needed" in msg_lower
+        ):
             space_requirements = "minimal"
         else:
             space_requirements = message.strip()
@@ -1256,33 +1842,14 @@ class CarRentalRecommenderApp:
         except Exception:
             _on_response_received(fallback_response)
 
-    def handle_distance_input(self, message):
+    def handle_distance_input(self, message, msg_lower=None):
         """Parse user distance input, confirm, and prompt for duration."""
-        import re
-
-        patterns = [
-            (r"(\d+(?:\.\d+)?)\s*(?:km|kilometers?|kms?)", "km", 1),
-            (r"(\d+(?:\.\d+)?)\s*(?:miles?|mi)", "miles", 1.60934),
-            (r"(\d+(?:\.\d+)?)\s*(?:minutes?|mins?)", "minutes", 1),
-            (r"(\d+(?:\.\d+)?)\s*(?:hours?|hrs?)", "hours", 30),
-            (r"(\d+(?:\.\d+)?)", "km", 1),
-        ]
-        distance = value = None
-        unit_type = "km"
-
-        msg = message.lower()
-        for pat, utype, factor in patterns:
-            m = re.search(pat, msg)
-            if m:
-                value = float(m.group(1))
-                if utype == "miles":
-                    distance = value * factor
-                elif utype == "hours":
-                    distance = value * factor
-                else:
-                    distance = value
-                unit_type = utype
-                break
+        if msg_lower is None:
+            msg_lower = message.lower().strip()
+
+        value, unit_type, distance = _parse_quantity(
+            _DISTANCE_PATTERN, _DISTANCE_UNITS, msg_lower, "km"
+        )
 
         if distance is not None and distance > 0:
             if distance > 1000:
@@ -1308,12 +1875,7 @@ class CarRentalRecommenderApp:
                 fallback_response = f"Got it! {distance:.1f} km (from {value} {unit_type}). Now, how many hours will you need the car for?"
             else:
                 fallback_response = f"Perfect! {distance} km. Now, how many hours will you need the car for?"
-            if distance <= 10:
-                fallback_response += "\n💡 **Short trip tip:** Perfect for local errands and quick outings!"
-            elif distance <= 50:
-                fallback_response += "\n🚗 **Medium trip tip:** Great for shopping, appointments, or city exploration!"
-            else:
-                fallback_response += "\n🌅 **Long trip tip:** Ideal for day trips, sightseeing, or visiting nearby areas!"
+            fallback_response += _DISTANCE_TIPS[bisect_left(_DISTANCE_TIP_BOUNDS, distance)]
             
             def _on_response_received(response):
                 self.add_bot_message(response, use_ollama=False)
@@ -1349,27 +1911,14 @@ class CarRentalRecommenderApp:
             self.add_bot_message(
                 "I couldn't find a valid distance in your message. Please tell me the distance in kilometers (e.g., '50 km', '25 miles', or just '50')."
             )
-    def handle_duration_input(self, message):
+    def handle_duration_input(self, message, msg_lower=None):
         """Parse and handle duration input, confirm with Ollama or fallback, then proceed."""
-        import re
-
-        patterns = [
-            (r"(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)", lambda v: (v, "hours")),
-            (r"(\d+(?:\.\d+)?)\s*(?:minutes?|mins?|m)", lambda v: (v / 60, "minutes")),
-            (r"(\d+(?:\.\d+)?)\s*(?:days?|d)", lambda v: (v * 24, "days")),
-            (r"^(\d+(?:\.\d+)?)\s*$", lambda v: (v, "hours")),
-        ]
-
-        duration = value = None
-        unit_type = "hours"
-        msg = message.lower()
+        if msg_lower is None:
+            msg_lower = message.lower().strip()
 
-        for pat, conv in patterns:
-            m = re.search(pat, msg)
-            if m:
-                value = float(m.group(1))
-                duration, unit_type = conv(value)
-                break
+        value, unit_type, duration = _parse_quantity(
+            _DURATION_PATTERN, _DURATION_UNITS, msg_lower, "hours", bare_whole=True
+        )
 
         if duration and duration > 0:
             if duration > 72:
@@ -1396,12 +1945,7 @@ class CarRentalRecommenderApp:
             else:
                 fallback_response = f"Great! {duration} hours. "
             fallback_response += "How many passengers will be traveling?"
-            if duration <= 2:
-                fallback_response += "\n⏰ **Quick rental tip:** Perfect for short errands and quick trips!"
-            elif duration <= 8:
-                fallback_response += "\n🚗 **Half-day rental tip:** Great for shopping, appointments, or leisure activities!"
-            else:
-                fallback_response += "\n🌅 **Full-day rental tip:** Ideal for sightseeing, long-distance travel, or multiple stops!"
+            fallback_response += _DURATION_TIPS[bisect_left(_DURATION_TIP_BOUNDS, duration)]
             
             def _on_response_received(response):
                 self.add_bot_message(response, use_ollama=False)
@@ -1432,15 +1976,18 @@ class CarRentalRecommenderApp:
             self.add_bot_message(
                 "I couldn't find a valid duration in your message. Please tell me the duration in hours (e.g., '2 hours', '90 minutes', or just '2')."
             )
-    def handle_contextual_response(self, message):
+    def handle_contextual_response(self, message, msg_lower=None, words=None):
         """
         Handle contextual responses and follow-up questions using Ollama if available.
         Fallback to manual responses if Ollama is unavailable.
         """
-        msg = message.lower().strip()
+        if msg_lower is None:
+            msg_lower = message.lower().strip()
+        if words is None:
+            words = _chat_words(msg_lower)
 
         # Restart command
-        if any(cmd in msg for cmd in ["restart", "new", "again", "reset"]):
+        if not _RESTART_WORDS.isdisjoint(words):
             self.restart_conversation()
             return
         
@@ -1450,31 +1997,24 @@ class CarRentalRecommenderApp:
         
         def _on_fallback():
             # Fallback: manual context handling
-            if self.chat_state.get("last_recommendations"):
-                msg_lower = message.lower()
-                if any(word in msg_lower for word in [
-                    "more", "details", "compare", "comparison", "explain", "why",
-                    "best", "cheaper", "expensive", "difference"
-                ]):
-                    self.add_bot_message(
-                        "If you'd like more details or a comparison of the recommended cars, please specify which car or aspect you're interested in (e.g., 'Compare the top 2', 'Why is Car A best?', or 'Show me more details about Car B')."
-                    )
-                elif any(word in msg_lower for word in ["help", "how", "what can you do", "instructions"]):
-                    self.add_bot_message(
-                        "You can ask for car recommendations, cost comparisons, or details about specific cars. For example: 'Show me the cheapest option', 'Compare electric vs. hybrid', or 'Tell me more about Car X'."
-                    )
-                elif any(word in msg_lower for word in ["change", "edit", "update", "modify", "different trip"]):
-                    self.add_bot_message(
-                        "To update your trip details, just tell me the new distance or duration, and I'll refresh the recommendations."
-                    )
-                else:
-                    self.add_bot_message(
-                        "Let me know if you want more info, a comparison, or to change your trip details!"
-                    )
+            recommendations = self.chat_state.get("last_recommendations")
+            if recommendations:
+                intent = _classify_chat_intent(msg_lower, words)
+                reply = _INTENT_REPLIES[intent]
+                if intent == "details":
+                    agg = self.chat_state.get("rec_aggregates") or _summarize_recommendations(recommendations)
+                    cheapest = recommendations[agg["cheapest_idx"]]
+                    reply = _DETAILS_OVERVIEW.format(
+                        count=len(recommendations),
+                        min=agg["min"],
+                        max=agg["max"],
+                        provider_count=len(agg["providers"]),
+                        model=cheapest.get("model", "Unknown Model"),
+                        provider=cheapest.get("provider", "Unknown Provider"),
+                    ) + reply
+                self.add_bot_message(reply)
             else:
-                self.add_bot_message(
-                    "I'm here to help! You can ask me about car rental recommendations, or start by telling me about your trip (date, distance, duration, passengers, space needs)."
-                )
+                self.add_bot_message(_NO_CONTEXT_REPLY)
         
         try:
             import ollama
@@ -1513,27 +2053,7 @@ class CarRentalRecommenderApp:
             return
         except Exception:
             _on_fallback()
-            return
-            msg_lower = message.lower()
-            if any(word in msg_lower for word in [
-                "more", "details", "compare", "comparison", "explain", "why",
-                "best", "cheaper", "expensive", "difference"
-            ]):
-                self.add_bot_message(
-                    "If you'd like more details or a comparison of the recommended cars, please specify which car or aspect you're interested in (e.g., 'Compare the top 2', 'Why is Car A best?', or 'Show me more details about Car B')."
-                )
-            elif any(word in msg_lower for word in ["help", "how", "what can you do", "instructions"]):
-                self.add_bot_message(
-                    "You can ask for car recommendations, cost comparisons, or details about specific cars. For example: 'Show me the cheapest option', 'Compare electric vs. hybrid', or 'Tell me more about Car X'."
-                )
-            elif any(word in msg_lower for word in ["change", "edit", "update", "modify", "different trip"]):
-                self.add_bot_message(
-                    "To update your trip details, just tell me the new distance or duration, and I'll refresh the recommendations."
-                )
-            else:
-                self.add_bot_message(
-                    "Let me know if you want more info, a comparison, or to change your trip details!"
-                )
+
     def get_chat_recommendations(self):
         """Get recommendations based on chat inputs asynchronously"""
         distance = self.chat_state.get("distance")
@@ -1564,37 +2084,31 @@ class CarRentalRecommenderApp:
                     is_weekend = self.is_weekend_var.get()
                 
                 selected_cat = self.car_cat_var.get()
-                use_ml = self.use_ml_var.get() if hasattr(self, "use_ml_var") else True
-                use_ollama = (
-                    self.use_ollama_var.get() if hasattr(self, "use_ollama_var") else False
-                )
-                ollama_model = (
-                    self.ollama_model_var.get()
-                    if hasattr(self, "use_ollama_var")
-                    else "llama3.1:3b"
-                )
+                # AI settings vars are created unconditionally in setup_recommendation_tab
+                use_ml = self.use_ml_var.get()
+                use_ollama = self.use_ollama_var.get()
+                ollama_model = self.ollama_model_var.get() or self.DEFAULT_OLLAMA_MODEL
                 
                 # Get passenger count and space requirements from settings if set, otherwise from chat state, with defaults
-                passenger_count = None
-                if hasattr(self, "passenger_count_var") and self.passenger_count_var.get():
+                passenger_setting = self.passenger_count_var.get()
+                if passenger_setting:
                     try:
-                        passenger_count = int(self.passenger_count_var.get())
+                        passenger_count = int(passenger_setting)
                     except:
                         passenger_count = self.chat_state.get("passenger_count", 2)
                 else:
                     passenger_count = self.chat_state.get("passenger_count", 2)
                 
-                space_requirements = None
-                if hasattr(self, "space_requirements_var") and self.space_requirements_var.get().strip():
-                    space_requirements = self.space_requirements_var.get().strip()
-                else:
+                space_requirements = self.space_requirements_var.get().strip()
+                if not space_requirements:
                     space_requirements = self.chat_state.get("space_requirements", "little")
 
                 # Get enhanced recommendations (region-aware)
-                region = self.current_region_var.get() if hasattr(self, "current_region_var") else "Singapore"
-                if region not in VALID_REGIONS:
-                    region = "Singapore"
-                cost_analysis = self.cost_analysis
+                region = self._get_current_region()
+                cost_analysis_key = self._cost_analysis_cache_key(region)
+                cost_analysis = (
+                    self.cost_analysis if cost_analysis_key == self._cost_analysis_key else None
+                )
                 if cost_analysis is None:
                     loading.update_message("Creating cost analysis...")
                     cost_analysis = create_complete_cost_analysis(self.df, region=region)
@@ -1656,9 +2170,12 @@ class CarRentalRecommenderApp:
 
                 def _update_ui():
                     loading.hide()
-                    # Update cost_analysis if it was created
-                    if self.cost_analysis is None:
-                        self.cost_analysis = cost_analysis
+                    # Keep a freshly built cost_analysis unless the data changed meanwhile
+                    if (
+                        self._cost_analysis_key != cost_analysis_key
+                        and self._cost_analysis_cache_key(region) == cost_analysis_key
+                    ):
+                        self._set_cost_analysis(cost_analysis, region, data_changed=False)
                     
                     # Display recommendations in chat
                     self.display_chat_recommendations(recommendations, distance, duration)
@@ -1757,7 +2274,7 @@ class CarRentalRecommenderApp:
                 f"🔬 **Analysis Method:** {method}",
             ]
             if confidence is not None:
-                emoji = "🟢" if confidence >= 0.8 else "🟡" if confidence >= 0.6 else "🔴"
+                emoji = _SUMMARY_SCORE_EMOJIS[bisect_right(_SUMMARY_SCORE_BOUNDS, confidence)]
                 lines.append(f"{emoji} **Confidence:** {confidence:.1%}")
         
         # Add passenger and space info if available
@@ -1768,7 +2285,7 @@ class CarRentalRecommenderApp:
         
         # Add size suitability if available
         if size_suitability is not None:
-            size_emoji = "🟢" if size_suitability >= 0.8 else "🟡" if size_suitability >= 0.6 else "🔴"
+            size_emoji = _SUMMARY_SCORE_EMOJIS[bisect_right(_SUMMARY_SCORE_BOUNDS, size_suitability)]
             lines.append(f"{size_emoji} **Size suitability:** {size_suitability:.0%}")
         
         # Add pricing model recommendation
@@ -1781,25 +2298,16 @@ class CarRentalRecommenderApp:
         if reasoning:
             display_reasoning = (reasoning[:150] + "...") if len(reasoning) > 150 else reasoning
             lines.append(f"💡 **Why this car:** {display_reasoning}")
-        if duration <= 2:
-            lines.append("⏰ **Quick trip tip:** Perfect for short errands or quick outings!")
-        elif duration <= 6:
-            lines.append("🚗 **Half-day trip:** Great for shopping, appointments, or leisure activities!")
-        else:
-            lines.append("🌅 **Full-day adventure:** Ideal for sightseeing, long-distance travel, or multiple stops!")
-        if total_cost < 25:
-            lines.append("💵 **Budget-friendly:** Excellent value for money!")
-        elif total_cost < 40:
-            lines.append("⚖️ **Balanced option:** Good mix of cost and convenience!")
-        else:
-            lines.append("⭐ **Premium choice:** Higher cost but maximum comfort and features!")
+        lines.append(_SUMMARY_DURATION_LINES[bisect_left(_SUMMARY_DURATION_BOUNDS, duration)])
+        lines.append(_SUMMARY_COST_LINES[bisect_right(_SUMMARY_COST_BOUNDS, total_cost)])
         lines.append(f"\n📋 I found {len(recommendations)} total options. Check the recommendations panel on the right for the full list!")
-        lines.append("💬 You can say 'restart' to get recommendations for a different trip, or ask me anything else!")
+        lines.append(_SUMMARY_FOOTER)
         final_summary = "\n".join(lines)
 
         self.add_bot_message(final_summary)
-        # Store recommendations for context
+        # Store recommendations and their aggregates for follow-up questions
         self.chat_state["last_recommendations"] = recommendations
+        self.chat_state["rec_aggregates"] = _summarize_recommendations(recommendations)
         self.chat_state["trip_context"] = {
             "distance": distance,
             "duration": duration,
@@ -1808,82 +2316,28 @@ class CarRentalRecommenderApp:
     def update_results_tree(self, recommendations):
         """Update the results treeview with new recommendations"""
         # Clear previous results
-        for i in self.results_tree.get_children():
-            self.results_tree.delete(i)
-
-        # Display recommendations in treeview
-        for i, rec in enumerate(recommendations):
-            provider = rec["provider"]
-            car_model = rec["model"]
-            cost = f"${rec['total_cost']:.2f}"
-            method = rec.get("method", "Standard")
-            confidence = f"{rec.get('confidence', 0.8):.1%}"
-            size_info = rec.get("inferred_size", "N/A")
-            if rec.get("size_suitability"):
-                size_info += f" ({rec['size_suitability']:.0%})"
-            pricing_model = rec.get("pricing_model", "N/A")
-            reasoning = rec.get("reasoning", "")
-
-            # Truncate reasoning for display
-            if method == "Ollama Analysis":
-                display_reasoning = (
-                    reasoning[:100] + "..." if len(reasoning) > 100 else reasoning
-                )
-            else:
-                display_reasoning = (
-                    reasoning[:50] + "..." if len(reasoning) > 50 else reasoning
-                )
+        self.results_tree.delete(*self.results_tree.get_children())
 
-            # Add to treeview with tags for coloring
-            tag = "best" if i == 0 else ""
-            if method == "Ollama Analysis":
-                tag = "ollama" if tag == "" else "ollama_best"
-            elif method == "ML Prediction":
-                tag = "ml" if tag == "" else "ml_best"
-            elif method == "Historical Analysis":
-                tag = "historical" if tag == "" else "historical_best"
-
-            # Store the full reasoning in the item for later retrieval
-            item_id = self.results_tree.insert(
-                "",
-                tk.END,
-                values=(
-                    provider,
-                    car_model,
-                    cost,
-                    method,
-                    confidence,
-                    size_info,
-                    pricing_model,
-                    display_reasoning,
-                    reasoning,
-                ),
-                tags=(tag,),
-            )
-
-        # Configure tags for different recommendation types
-        self.results_tree.tag_configure("best", background="#e6ffe6")
-        self.results_tree.tag_configure("ollama", background="#e6ffe6")
-        self.results_tree.tag_configure("ollama_best", background="#b3ffb3")
-        self.results_tree.tag_configure("ml", background="#e6f3ff")
-        self.results_tree.tag_configure("ml_best", background="#b3d9ff")
-        self.results_tree.tag_configure("historical", background="#fff2e6")
-        self.results_tree.tag_configure("historical_best", background="#ffd9b3")
+        # Format every row first, then insert them with their colour tags
+        rows = [_results_tree_values(rec) for rec in recommendations]
+        for i, values in enumerate(rows):
+            is_best = i == 0
+            tag = _RESULTS_TREE_ROW_TAGS.get((is_best, values[3]), "best" if is_best else "")
+            self.results_tree.insert("", tk.END, values=values, tags=(tag,))
 
         # Update status
         distance = self.chat_state["distance"]
         duration = self.chat_state["duration"]
-        ollama_count = sum(
-            1 for rec in recommendations if rec.get("method") == "Ollama Analysis"
-        )
-        ml_count = sum(
-            1 for rec in recommendations if rec.get("method") == "ML Prediction"
-        )
-        historical_count = sum(
-            1 for rec in recommendations if rec.get("method") == "Historical Analysis"
-        )
+        if self.chat_state.get("last_recommendations") is recommendations:
+            aggregates = self.chat_state["rec_aggregates"]
+        else:
+            aggregates = _summarize_recommendations(recommendations)
+        methods = aggregates["methods"]
+        ollama_count = methods["Ollama Analysis"]
+        ml_count = methods["ML Prediction"]
+        historical_count = methods["Historical Analysis"]
         fallback_count = sum(
-            1 for r in recommendations if "Fallback" in r.get("method", "")
+            count for method, count in methods.items() if "Fallback" in method
         )
 
         if fallback_count > 0:
@@ -1903,8 +2357,9 @@ class CarRentalRecommenderApp:
             "distance": None,
             "duration": None,
             "conversation_started": False,
-            "conversation_history": [],
+            "conversation_history": deque(maxlen=CHAT_HISTORY_LIMIT),
             "last_recommendations": None,
+            "rec_aggregates": None,
             "user_preferences": {},
             "trip_context": {},
         }
@@ -1964,6 +2419,21 @@ class CarRentalRecommenderApp:
             ("Seasonal Patterns", "seasonal_patterns"),
             ("Usage Patterns", "usage_patterns"),
         ]
+        self._analysis_label = {v: k for k, v in self.analyses}
+        self._analysis_dispatch = {
+            "provider_comparison": self.show_provider_comparison,
+            "cost_trends": self.show_cost_trends,
+            "car_models": self.show_car_models_analysis,
+            "car_categories": self.show_car_categories_analysis,
+            "monthly_summary": self.show_monthly_summary,
+            "fuel_efficiency": self.show_fuel_efficiency_analysis,
+            "weekend_weekday": self.show_weekend_weekday_analysis,
+            "distance_cost": self.show_distance_cost_analysis,
+            "electric_vs_traditional": self.show_electric_vs_traditional_analysis,
+            "cost_efficiency": self.show_cost_efficiency_analysis,
+            "seasonal_patterns": self.show_seasonal_patterns_analysis,
+            "usage_patterns": self.show_usage_patterns_analysis,
+        }
         add_radiobuttons(
             left_panel, self.analyses, self.analysis_var, self.update_analysis_chart
         )
@@ -1973,7 +2443,7 @@ class CarRentalRecommenderApp:
         self.analysis_region_label = ttk.Label(
             left_panel,
             text="Data for region: " + (self._get_current_region() if hasattr(self, "current_region_var") else "Singapore"),
-            font=("Segoe UI", 9),
+            font=_FONT_SMALL,
         )
         self.analysis_region_label.pack(anchor=tk.W, padx=5, pady=2)
 
@@ -1990,6 +2460,7 @@ class CarRentalRecommenderApp:
             ("Last Month", "last_month"),
             ("This Month", "this_month"),
         ]
+        self._period_label = {v: k for k, v in self.periods}
         add_radiobuttons(
             left_panel, self.periods, self.period_var, self.update_analysis_chart
         )
@@ -1998,7 +2469,7 @@ class CarRentalRecommenderApp:
         add_button(
             left_panel,
             text="Run Analysis",
-            command=self.update_analysis_chart,
+            command=lambda: self.update_analysis_chart(force=True),
             style="Accent.TButton",
             pady=15,
         )
@@ -2032,8 +2503,13 @@ class CarRentalRecommenderApp:
         self.stats_grid.pack(fill=tk.X, expand=True, padx=5, pady=5)
         self.stats_grid.columnconfigure(0, weight=1)  # Allow the column to expand
 
-        # Initialize stats labels (will be populated when analysis runs)
+        # Stat rows by position: (frame, name label, value label). Rows are hidden
+        # between analyses and re-texted by the next one, so the pool only grows
+        # to the most stats a single analysis shows
         self.stats_labels = []
+        self._stats_row = 0
+        # (label, value) pairs shown by the analysis being drawn, replayed on cached views
+        self._stats_log = []
 
         # Chart frame
         self.analysis_chart_frame = ttk.LabelFrame(
@@ -2043,6 +2519,14 @@ class CarRentalRecommenderApp:
 
         # Create a figure and canvas for the chart
         self.analysis_fig, self.analysis_ax = plt.subplots(figsize=(10, 6), dpi=100)
+        # Axes per analysis view as [axes, data key it was drawn for, stats shown];
+        # None is the axis shared by the views listed outside _CACHED_ANALYSIS_VIEWS
+        self._analysis_views = {None: [self.analysis_ax, None, []]}
+        # Axes -> layout key of the last tight_layout run for it (_layout_analysis_fig)
+        self._analysis_layouts = {}
+        # Cost Trends point labels, reused by _set_trend_labels while the axis persists
+        self._trend_labels = []
+        self._trend_labels_ax = None
         self.analysis_canvas = FigureCanvasTkAgg(
             self.analysis_fig, master=self.analysis_chart_frame
         )
@@ -2055,31 +2539,74 @@ class CarRentalRecommenderApp:
         self.analysis_toolbar.update()
         self.analysis_toolbar.pack(fill=tk.X)
 
-    def update_analysis_chart(self):
-        """Update the analysis chart based on selected options"""
+    def update_analysis_chart(self, force=False):
+        """Update the analysis chart based on selected options.
+
+        Args:
+            force: Redraw even if the chart on screen was drawn from the same inputs
+                (the Run Analysis button)
+        """
         if not self._check_data_loaded():
             return
 
         # Update region label (data is filtered by this region)
+        region = self._get_current_region()
         if hasattr(self, "analysis_region_label"):
-            self.analysis_region_label.config(text="Data for region: " + self._get_current_region())
-
-        # Clear previous stats and chart
-        self.analysis_fig.clear()  # Clear the entire figure
-        self.analysis_ax = self.analysis_fig.add_subplot(111)  # Recreate the main axis
-        for label in self.stats_labels:
-            label.destroy()
-        self.stats_labels = []
+            self.analysis_region_label.config(text="Data for region: " + region)
 
         # Get selected options
         analysis_type = self.analysis_var.get()
         period = self.period_var.get()
 
+        # Tab switches and repeated clicks often ask for the chart already on screen;
+        # skip the full figure rebuild and re-render when nothing it depends on changed
+        chart_key = (
+            analysis_type,
+            period,
+            region,
+            id(self.df),
+            len(self.df.index),
+            pd.Timestamp.now().date(),
+            # Electric vs Traditional prices trips with the calculator settings
+            self.fuel_price_var.get(),
+            self.cost_per_kwh_var.get(),
+        )
+        if chart_key == self._analysis_chart_key and not force:
+            return
+        self._analysis_chart_key = None
+
+        # Clear previous stats and switch to this view's axis
+        view = analysis_type if analysis_type in _CACHED_ANALYSIS_VIEWS else None
+        data_key = chart_key[1:]
+        existed = self._show_analysis_axes(view)
+        entry = self._analysis_views[view]
+        for frame, _, _ in self.stats_labels[: self._stats_row]:
+            frame.grid_remove()
+        self._stats_row = 0
+
+        if view is not None and existed and entry[1] == data_key and not force:
+            # Drawn earlier from the same data: only the axes visibility changed
+            for label, value in entry[2]:
+                self.add_stat(label, value)
+            # Other views' tight_layout calls move the shared subplot position
+            self._layout_analysis_fig()
+            self.analysis_canvas.draw_idle()
+            self.status_var.set(
+                f"Analysis completed: {self._analysis_label[analysis_type]} "
+                f"for {self._period_label[period]}"
+            )
+            self._analysis_chart_key = chart_key
+            return
+
+        self.analysis_ax.cla()
+        entry[1] = None
+        self._stats_log = entry[2] = []
+
         # Filter data by time period
         filtered_df = self.filter_data_by_period(period)
         # Restrict to current region so Singapore and Malaysia are not mixed
         if not filtered_df.empty and "Region" in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df["Region"] == self._get_current_region()].copy()
+            filtered_df = filtered_df[filtered_df["Region"] == region].copy()
 
         if filtered_df.empty:
             # Show empty state on chart
@@ -2092,45 +2619,27 @@ class CarRentalRecommenderApp:
                 color="gray",
             )
             self.analysis_fig.tight_layout()
-            self.analysis_canvas.draw()
+            self.analysis_canvas.draw_idle()
             self.status_var.set("No data available for selected period")
+            self._analysis_chart_key = chart_key
             return
 
         try:
             # Perform the selected analysis
-            if analysis_type == "provider_comparison":
-                self.show_provider_comparison(filtered_df)
-            elif analysis_type == "cost_trends":
-                self.show_cost_trends(filtered_df)
-            elif analysis_type == "car_models":
-                self.show_car_models_analysis(filtered_df)
-            elif analysis_type == "car_categories":
-                self.show_car_categories_analysis(filtered_df)
-            elif analysis_type == "monthly_summary":
-                self.show_monthly_summary(filtered_df)
-            elif analysis_type == "fuel_efficiency":
-                self.show_fuel_efficiency_analysis(filtered_df)
-            elif analysis_type == "weekend_weekday":
-                self.show_weekend_weekday_analysis(filtered_df)
-            elif analysis_type == "distance_cost":
-                self.show_distance_cost_analysis(filtered_df)
-            elif analysis_type == "electric_vs_traditional":
-                self.show_electric_vs_traditional_analysis(filtered_df)
-            elif analysis_type == "cost_efficiency":
-                self.show_cost_efficiency_analysis(filtered_df)
-            elif analysis_type == "seasonal_patterns":
-                self.show_seasonal_patterns_analysis(filtered_df)
-            elif analysis_type == "usage_patterns":
-                self.show_usage_patterns_analysis(filtered_df)
+            show_analysis = self._analysis_dispatch.get(analysis_type)
+            if show_analysis is not None:
+                show_analysis(filtered_df)
 
             # Convert analysis type and period to their display names
-            analysis_name = {v: k for k, v in self.analyses}[analysis_type]
-            period_name = {v: k for k, v in self.periods}[period]
+            analysis_name = self._analysis_label[analysis_type]
+            period_name = self._period_label[period]
 
             # Update status
             self.status_var.set(
                 f"Analysis completed: {analysis_name} for {period_name}"
             )
+            self._analysis_chart_key = chart_key
+            entry[1] = data_key
         except Exception as e:
             messagebox.showerror(
                 "Analysis Error", f"An error occurred during analysis: {str(e)}"
@@ -2150,43 +2659,54 @@ class CarRentalRecommenderApp:
                 color="red",
             )
             self.analysis_fig.tight_layout()
-            self.analysis_canvas.draw()
+            self.analysis_canvas.draw_idle()
 
-    def filter_data_by_period(self, period):
-        """Filter dataframe by time period"""
-        if period == "all" or "Date" not in self.df.columns:
-            return self.df.copy()
+    def _show_analysis_axes(self, view):
+        """Make the axes of view the visible analysis axis, hiding other views' axes.
 
-        # Ensure Date column is datetime
-        df_copy = self.df.copy()
-        if not pd.api.types.is_datetime64_dtype(df_copy["Date"]):
-            try:
-                df_copy["Date"] = pd.to_datetime(df_copy["Date"])
-            except:
-                return df_copy  # Return unfiltered if conversion fails
+        Multi-panel charts, twin axes and colorbars are not tracked, so a figure
+        holding any of them is cleared first.
 
-        now = pd.Timestamp.now()
-
-        if period == "last_3_months":
-            start_date = now - pd.DateOffset(months=3)
-            return df_copy[df_copy["Date"] >= start_date]
-
-        elif period == "last_6_months":
-            start_date = now - pd.DateOffset(months=6)
-            return df_copy[df_copy["Date"] >= start_date]
-
-        elif period == "this_year":
-            start_date = pd.Timestamp(now.year, 1, 1)
-            return df_copy[df_copy["Date"] >= start_date]
+        Returns:
+            bool: True if the axes of view was already on the figure
+        """
+        fig = self.analysis_fig
+        views = self._analysis_views
+        owned = {axes for axes, _, _ in views.values()}
+        if any(axes not in owned for axes in fig.axes):
+            fig.clear()
+            views.clear()
+            self._analysis_layouts.clear()
+        entry = views.get(view)
+        existed = entry is not None
+        if not existed:
+            entry = views[view] = [fig.add_subplot(111), None, []]
+        for other in views.values():
+            other[0].set_visible(other is entry)
+        self.analysis_ax = entry[0]
+        return existed
 
-        elif period == "last_month":
-            start_date = now - pd.DateOffset(months=1)
-            return df_copy[df_copy["Date"] >= start_date]
+    def filter_data_by_period(self, period):
+        """Filter dataframe by time period.
 
-        elif period == "this_month":
-            start_date = pd.Timestamp(now.year, now.month, 1)
-            return df_copy[df_copy["Date"] >= start_date]
-        return df_copy
+        Returns self.df itself for "all" and a row slice otherwise; callers
+        must not modify the result in place.
+        """
+        start = _PERIOD_STARTS.get(period)
+        if start is None or "Date" not in self.df.columns:
+            return self.df
+
+        # Records added or edited in the form arrive as strings; normalise once
+        if not pd.api.types.is_datetime64_dtype(self.df["Date"]):
+            self.df["Date"] = pd.to_datetime(self.df["Date"], errors="coerce")
+
+        dates = self.df["Date"]
+        start_date = start(pd.Timestamp.now())
+        if dates.is_monotonic_increasing:
+            # Loaded data is sorted by Date: binary-search the first row in the period
+            return self.df.iloc[dates.searchsorted(start_date, side="left"):]
+        # Added/edited records or missing dates break the order; fall back to a mask
+        return self.df[dates >= start_date]
 
     def show_provider_comparison(self, df):
         """Show comparison between different providers"""
@@ -2195,37 +2715,24 @@ class CarRentalRecommenderApp:
             messagebox.showwarning("Missing Data", "Provider information is missing")
             return
 
-        # Group by provider
-        provider_stats = (
-            df.groupby("Car Cat")
-            .agg(
-                {
-                    "Total": ["mean", "count", "sum"],
-                    "Distance (KM)": ["sum", "mean"],
-                    "Rental hour": ["sum", "mean"],
-                    "Cost per KM": ["mean"],
-                    "Cost/HR": ["mean"],
-                }
-            )
-            .reset_index()
+        # Group by provider; only the columns the chart uses are aggregated
+        provider_stats = df.groupby("Car Cat").agg(
+            total_mean=("Total", "mean"),
+            total_count=("Total", "count"),
         )
 
-        # Flatten multi-index columns
-        provider_stats.columns = [
-            "_".join(col).strip("_") for col in provider_stats.columns.values
-        ]
-
         # Display key statistics
+        totals = df["Total"]
         self.add_stat("Total Trips", f"{len(df)}")
-        self.add_stat("Total Spending", f"${df['Total'].sum():.2f}")
-        self.add_stat("Average Cost per Trip", f"${df['Total'].mean():.2f}")
+        self.add_stat("Total Spending", f"${totals.sum():.2f}")
+        self.add_stat("Average Cost per Trip", f"${totals.mean():.2f}")
         self.add_stat("Total Distance", f"{df['Distance (KM)'].sum():.1f} km")
         self.add_stat("Total Rental Hours", f"{df['Rental hour'].sum():.1f} hrs")
 
         # Create bar chart comparing providers
-        providers = provider_stats["Car Cat"].tolist()
-        avg_costs = provider_stats["Total_mean"].tolist()
-        trip_counts = provider_stats["Total_count"].tolist()
+        providers = provider_stats.index.tolist()
+        avg_costs = provider_stats["total_mean"].tolist()
+        trip_counts = provider_stats["total_count"].to_numpy()
 
         # Clear the axis and plot average cost by provider
         self.analysis_ax.clear()
@@ -2233,32 +2740,22 @@ class CarRentalRecommenderApp:
             providers, avg_costs, width=0.6, color="#4a6984", alpha=0.7
         )
 
-        # Add trip count as text
-        for i, (bar, count) in enumerate(zip(bars, trip_counts)):
-            height = bar.get_height()
-            self.analysis_ax.text(
-                bar.get_x() + bar.get_width() / 2,
-                height + 0.5,
-                f"{count} trips",
-                ha="center",
-                va="bottom",
-                color="black",
-                fontsize=9,
-            )
-
-        # Add data labels
-        for bar in bars:
-            height = bar.get_height()
-            self.analysis_ax.text(
-                bar.get_x() + bar.get_width() / 2,
-                height / 2,
-                f"${height:.2f}",
-                ha="center",
-                va="center",
-                color="white",
-                fontsize=9,
-                fontweight="bold",
-            )
+        # Trip count above each bar, average cost inside it
+        self.analysis_ax.bar_label(
+            bars,
+            labels=np.char.add(trip_counts.astype(str), " trips").tolist(),
+            padding=3,
+            color="black",
+            fontsize=9,
+        )
+        self.analysis_ax.bar_label(
+            bars,
+            labels=_money_labels(avg_costs),
+            label_type="center",
+            color="white",
+            fontsize=9,
+            fontweight="bold",
+        )
 
         # Set chart properties
         self.analysis_ax.set_title("Average Cost by Provider", fontsize=12)
@@ -2267,8 +2764,8 @@ class CarRentalRecommenderApp:
         self.analysis_ax.grid(axis="y", linestyle="--", alpha=0.3)
 
         # Update chart
-        self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self._layout_analysis_fig(tuple(providers))
+        self.analysis_canvas.draw_idle()
 
     def show_cost_trends(self, df):
         """Show cost trends over time"""
@@ -2278,75 +2775,56 @@ class CarRentalRecommenderApp:
             )
             return
 
-        # Ensure we have datetime data
-        df_copy = df.copy()
-        if not pd.api.types.is_datetime64_dtype(df_copy["Date"]):
+        # Ensure we have datetime data (loaded data is converted once at load time)
+        dates = df["Date"]
+        if not pd.api.types.is_datetime64_dtype(dates):
             try:
-                df_copy["Date"] = pd.to_datetime(df_copy["Date"])
+                dates = pd.to_datetime(dates)
             except:
                 messagebox.showwarning("Data Error", "Could not parse dates correctly")
                 return
 
-        # Add month and year columns if not already present
-        if "Month" not in df_copy.columns:
-            df_copy["Month"] = df_copy["Date"].dt.month
-        if "Year" not in df_copy.columns:
-            df_copy["Year"] = df_copy["Date"].dt.year
-
-        # Create Month-Year column for grouping
-        df_copy["Month-Year"] = df_copy["Date"].dt.strftime("%b %Y")
-
-        # Group by month and calculate average costs
-        monthly_avg = (
-            df_copy.groupby("Month-Year")
-            .agg(
-                {
-                    "Total": "mean",
-                    "Cost per KM": "mean",
-                    "Cost/HR": "mean",
-                    "Distance (KM)": "mean",
-                    "Date": "first",  # Keep one date per month for sorting
-                }
-            )
-            .reset_index()
-        )
-
-        # Sort by date
-        monthly_avg = monthly_avg.sort_values("Date")
+        # Average costs per calendar month: resample bins on the datetime values
+        # directly, no per-row "Mon YYYY" strings to hash and re-sort
+        cost_columns = [
+            col for col in ("Total", "Cost per KM", "Cost/HR", "Distance (KM)")
+            if col in df.columns
+        ]
+        by_month = df[cost_columns].set_index(pd.DatetimeIndex(dates)).resample("MS")
+        monthly_avg = by_month.mean()
+        monthly_avg = monthly_avg[by_month.size() > 0]  # Drop months with no trips
+        months = monthly_avg.index.strftime("%b %Y").tolist()
+        avg_total = monthly_avg["Total"].to_numpy()
 
         # Display key statistics
-        if not monthly_avg.empty:
-            min_month = monthly_avg.loc[monthly_avg["Total"].idxmin(), "Month-Year"]
-            max_month = monthly_avg.loc[monthly_avg["Total"].idxmax(), "Month-Year"]
+        if months:
+            # Positions straight from the plotted array; nan* skips months without a Total
+            min_pos = np.nanargmin(avg_total)
+            max_pos = np.nanargmax(avg_total)
 
-            min_cost = monthly_avg["Total"].min()
-            max_cost = monthly_avg["Total"].max()
-            avg_cost = df_copy["Total"].mean()
-
-            self.add_stat("Average Trip Cost", f"${avg_cost:.2f}")
-            self.add_stat("Lowest Month", f"{min_month} (${min_cost:.2f})")
-            self.add_stat("Highest Month", f"{max_month} (${max_cost:.2f})")
-
-            first_month = monthly_avg["Month-Year"].iloc[0]
-            last_month = monthly_avg["Month-Year"].iloc[-1]
-            self.add_stat("Period", f"{first_month} to {last_month}")
+            self.add_stat("Average Trip Cost", f"${df['Total'].mean():.2f}")
+            self.add_stat("Lowest Month", f"{months[min_pos]} (${avg_total[min_pos]:.2f})")
+            self.add_stat("Highest Month", f"{months[max_pos]} (${avg_total[max_pos]:.2f})")
+            self.add_stat("Period", f"{months[0]} to {months[-1]}")
 
         # Plot the trend
-        months = monthly_avg["Month-Year"].tolist()
-        avg_total = monthly_avg["Total"].tolist()
         avg_per_km = (
-            monthly_avg["Cost per KM"].tolist()
+            monthly_avg["Cost per KM"].to_numpy()
             if "Cost per KM" in monthly_avg.columns
-            else []
+            else None
         )
         avg_per_hour = (
-            monthly_avg["Cost/HR"].tolist() if "Cost/HR" in monthly_avg.columns else []
+            monthly_avg["Cost/HR"].to_numpy() if "Cost/HR" in monthly_avg.columns else None
         )
 
+        # Plot against integer positions; string x values would go through
+        # matplotlib's category converter on every plot call
+        month_positions = np.arange(len(months))
+
         # Clear the axis and plot primary axis: Average total cost
         self.analysis_ax.clear()
         self.analysis_ax.plot(
-            months,
+            month_positions,
             avg_total,
             marker="o",
             linestyle="-",
@@ -2357,9 +2835,9 @@ class CarRentalRecommenderApp:
         )
 
         # Plot on the same axis if we have per km and per hour costs
-        if avg_per_km and not all(pd.isna(avg_per_km)):
+        if avg_per_km is not None and not np.isnan(avg_per_km).all():
             self.analysis_ax.plot(
-                months,
+                month_positions,
                 avg_per_km,
                 marker="s",
                 linestyle="--",
@@ -2369,9 +2847,9 @@ class CarRentalRecommenderApp:
                 label="Avg Cost per KM",
             )
 
-        if avg_per_hour and not all(pd.isna(avg_per_hour)):
+        if avg_per_hour is not None and not np.isnan(avg_per_hour).all():
             self.analysis_ax.plot(
-                months,
+                month_positions,
                 avg_per_hour,
                 marker="^",
                 linestyle="-.",
@@ -2384,7 +2862,7 @@ class CarRentalRecommenderApp:
         # Set chart properties
         self.analysis_ax.set_title("Average Rental Costs Over Time", fontsize=12)
         self.analysis_ax.set_ylabel("Cost ($)", fontsize=10)
-        self.analysis_ax.set_xticks(range(len(months)))
+        self.analysis_ax.set_xticks(month_positions)
         self.analysis_ax.set_xticklabels(months, rotation=45, ha="right", fontsize=9)
         self.analysis_ax.grid(True, linestyle="--", alpha=0.3)
 
@@ -2392,23 +2870,89 @@ class CarRentalRecommenderApp:
         self.analysis_ax.legend()
 
         # Add data labels for total cost
-        for i, (x, y) in enumerate(zip(range(len(months)), avg_total)):
-            self.analysis_ax.annotate(
-                f"${y:.2f}",
+        self._set_trend_labels(avg_total)
+
+        # Adjust layout; the point labels can reach past the top of the axis
+        self._layout_analysis_fig(
+            (
+                tuple(months),
+                tuple(self.analysis_ax.get_legend_handles_labels()[1]),
+                tuple(avg_total),
+            )
+        )
+        self.analysis_canvas.draw_idle()
+
+    def _layout_analysis_fig(self, geometry=None):
+        """Run tight_layout on the analysis figure unless it would not move anything.
+
+        Args:
+            geometry: Hashable summary of what sizes the margins (tick labels,
+                legend entries); None reuses the one from the axis' last layout
+
+        The key also covers the y-limits, the figure size and the current subplot
+        parameters, which other views' layouts change.
+        """
+        fig = self.analysis_fig
+        ax = self.analysis_ax
+        last = self._analysis_layouts.get(ax)
+        if geometry is None:
+            if last is None:
+                fig.tight_layout()
+                return
+            geometry = last[0]
+        size = (tuple(fig.get_size_inches()), fig.dpi)
+        pars = fig.subplotpars
+        key = (geometry, ax.get_ylim(), size, (pars.left, pars.right, pars.bottom, pars.top))
+        if key == last:
+            return
+        fig.tight_layout()
+        pars = fig.subplotpars
+        self._analysis_layouts[ax] = key[:3] + ((pars.left, pars.right, pars.bottom, pars.top),)
+
+    def _set_trend_labels(self, values):
+        """Label point i of the Cost Trends line with values[i].
+
+        cla() only detaches the previous labels, so while the analysis axis is
+        the same object they are moved, re-texted and re-attached instead of
+        being rebuilt; new Annotations are only created when there are more points.
+        """
+        ax = self.analysis_ax
+        if self._trend_labels_ax is not ax:
+            self._trend_labels = []
+            self._trend_labels_ax = ax
+        labels = self._trend_labels
+        texts = _money_labels(values)
+        for x, (label, y, text) in enumerate(zip(labels, values, texts)):
+            label.xy = (x, y)
+            label.set_text(text)
+            ax.add_artist(label)
+        for x in range(len(labels), len(values)):
+            y = values[x]
+            label = ax.annotate(
+                texts[x],
                 (x, y),
                 xytext=(0, 5),
                 textcoords="offset points",
                 ha="center",
                 fontsize=8,
             )
-
-        # Adjust layout
-        self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+            # Drawn unclipped like a fresh annotation, even after add_artist sets a clip path
+            label.set_clip_on(False)
+            labels.append(label)
 
     def add_stat(self, label, value):
         """Add a statistic to the stats grid (displayed in rows)"""
-        row = len(self.stats_labels) // 2  # Each stat uses 2 widgets (label and value)
+        row = self._stats_row
+        self._stats_row += 1
+        self._stats_log.append((label, value))
+
+        if row < len(self.stats_labels):
+            # Reuse the row widgets from an earlier analysis
+            frame, label_widget, value_widget = self.stats_labels[row]
+            label_widget.config(text=f"{label}:")
+            value_widget.config(text=value)
+            frame.grid()
+            return
 
         # Create a frame for this statistic (horizontal layout)
         frame = ttk.Frame(self.stats_grid)
@@ -2416,14 +2960,13 @@ class CarRentalRecommenderApp:
         frame.columnconfigure(1, weight=1)  # Allow value column to expand
 
         # Add label and value side by side
-        label_widget = ttk.Label(frame, text=f"{label}:", font=("Segoe UI", 9))
+        label_widget = ttk.Label(frame, text=f"{label}:", font=_FONT_SMALL)
         label_widget.grid(row=0, column=0, padx=(0, 10), sticky=tk.W)
 
-        value_widget = ttk.Label(frame, text=value, font=("Segoe UI", 10, "bold"))
+        value_widget = ttk.Label(frame, text=value, font=_FONT_NORMAL_BOLD)
         value_widget.grid(row=0, column=1, sticky=tk.W)
 
-        # Store references to labels for later cleanup
-        self.stats_labels.extend([frame, label_widget, value_widget])
+        self.stats_labels.append((frame, label_widget, value_widget))
 
     def export_analysis_results(self):
         """Export analysis results to CSV"""
@@ -2455,82 +2998,56 @@ class CarRentalRecommenderApp:
             # Create a summary DataFrame
             if analysis_type == "provider_comparison":
                 # Group by provider
-                result_df = (
-                    filtered_df.groupby("Car Cat")
-                    .agg(
-                        {
-                            "Total": ["mean", "count", "sum"],
-                            "Distance (KM)": ["sum", "mean"],
-                            "Rental hour": ["sum", "mean"],
-                            "Cost per KM": ["mean"],
-                            "Cost/HR": ["mean"],
-                        }
-                    )
-                    .reset_index()
-                )
-
-                # Flatten multi-index columns
-                result_df.columns = [
-                    "_".join(col).strip("_") for col in result_df.columns.values
-                ]
-
-            elif analysis_type == "cost_trends":
-                # Ensure Date column is datetime
-                df_copy = filtered_df.copy()
-                df_copy["Date"] = pd.to_datetime(df_copy["Date"])
-
-                # Extract month-year for grouping
-                df_copy["Month"] = df_copy["Date"].dt.to_period("M")
-
-                # Group by month
-                result_df = (
-                    df_copy.groupby("Month")
-                    .agg(
-                        {
-                            "Total": ["mean", "sum", "count"],
-                            "Distance (KM)": ["sum"],
-                            "Rental hour": ["sum"],
-                        }
-                    )
-                    .reset_index()
+                result_df = _grouped_agg(
+                    filtered_df,
+                    "Car Cat",
+                    {
+                        "Total": ["mean", "count", "sum"],
+                        "Distance (KM)": ["sum", "mean"],
+                        "Rental hour": ["sum", "mean"],
+                        "Cost per KM": ["mean"],
+                        "Cost/HR": ["mean"],
+                    },
                 )
 
-                # Flatten multi-index columns
-                result_df.columns = [
-                    "_".join(col).strip("_") for col in result_df.columns.values
-                ]
+            elif analysis_type == "cost_trends":
+                # Group by calendar month (no copy of the filtered rows needed)
+                # Dates are parsed at load time; only parse here if they are still text
+                dates = filtered_df["Date"]
+                if not pd.api.types.is_datetime64_dtype(dates):
+                    dates = pd.to_datetime(dates)
+                months = dates.dt.to_period("M").rename("Month")
+                result_df = _grouped_agg(
+                    filtered_df,
+                    months,
+                    {
+                        "Total": ["mean", "sum", "count"],
+                        "Distance (KM)": ["sum"],
+                        "Rental hour": ["sum"],
+                    },
+                )
 
             elif analysis_type == "car_categories":
                 # Group by car category
-                result_df = (
-                    filtered_df.groupby("Car Cat")
-                    .agg(
-                        {
-                            "Total": ["mean", "count", "sum"],
-                            "Distance (KM)": ["sum", "mean"],
-                            "Rental hour": ["sum", "mean"],
-                            "Cost per KM": ["mean"],
-                            "Cost/HR": ["mean"],
-                            "Consumption (KM/L)": ["mean"],
-                        }
-                    )
-                    .reset_index()
+                result_df = _grouped_agg(
+                    filtered_df,
+                    "Car Cat",
+                    {
+                        "Total": ["mean", "count", "sum"],
+                        "Distance (KM)": ["sum", "mean"],
+                        "Rental hour": ["sum", "mean"],
+                        "Cost per KM": ["mean"],
+                        "Cost/HR": ["mean"],
+                        "Consumption (KM/L)": ["mean"],
+                    },
                 )
 
-                # Flatten multi-index columns
-                result_df.columns = [
-                    "_".join(col).strip("_") for col in result_df.columns.values
-                ]
-
             else:
                 # For other analyses, just export the filtered data
                 result_df = filtered_df
 
             # Save to file
-            if file_path.endswith(".xlsx"):
-                result_df.to_excel(file_path, index=False)
-            else:
-                result_df.to_csv(file_path, index=False)
+            _export_table(result_df, file_path)
 
             messagebox.showinfo(
                 "Export Complete", f"Data exported successfully to {file_path}"
@@ -2788,8 +3305,7 @@ class CarRentalRecommenderApp:
     def refresh_tank_capacity_tree(self):
         """Refresh the tank capacity treeview with current settings"""
         # Clear existing items
-        for item in self.tank_capacity_tree.get_children():
-            self.tank_capacity_tree.delete(item)
+        self.tank_capacity_tree.delete(*self.tank_capacity_tree.get_children())
         
         # Add items from settings
         capacities = self.settings.get("car_model_tank_capacities", {})
@@ -2844,6 +3360,7 @@ class CarRentalRecommenderApp:
         
         # Refresh treeview
         self.refresh_tank_capacity_tree()
+        self._mark_settings_dirty()
         
         # Clear input fields
         self.tank_capacity_model_var.set("")
@@ -2904,6 +3421,7 @@ class CarRentalRecommenderApp:
         
         # Refresh treeview
         self.refresh_tank_capacity_tree()
+        self._mark_settings_dirty()
         
         # Clear input fields
         self.tank_capacity_model_var.set("")
@@ -2936,6 +3454,7 @@ class CarRentalRecommenderApp:
         
         # Refresh treeview
         self.refresh_tank_capacity_tree()
+        self._mark_settings_dirty()
         
         # Clear input fields
         self.tank_capacity_model_var.set("")
@@ -2994,6 +3513,7 @@ class CarRentalRecommenderApp:
         
         # Refresh treeview
         self.refresh_tank_capacity_tree()
+        self._mark_settings_dirty()
         
         messagebox.showinfo(
             "Success", 
@@ -3044,6 +3564,7 @@ class CarRentalRecommenderApp:
         
         # Refresh treeview
         self.refresh_tank_capacity_tree()
+        self._mark_settings_dirty()
         
         messagebox.showinfo(
             "Success", 
@@ -3107,8 +3628,10 @@ class CarRentalRecommenderApp:
         x_scrollbar = ttk.Scrollbar(
             records_frame, orient="horizontal", command=self.records_tree.xview
         )
+        self.records_y_scrollbar = y_scrollbar
         self.records_tree.configure(
-            yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set
+            yscrollcommand=self._on_records_tree_yscroll,
+            xscrollcommand=x_scrollbar.set,
         )
 
         # Improved packing order for better layout and resizing
@@ -3157,7 +3680,7 @@ class CarRentalRecommenderApp:
         ttk.Label(search_frame, text="🔍 Search:").pack(side="left", padx=2)
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=20)
         search_entry.pack(side="left", padx=2)
-        search_entry.bind("<KeyRelease>", self.filter_records)
+        search_entry.bind("<KeyRelease>", self._schedule_filter_records)
 
         # LLM Assistant Frame for natural language input
         llm_assistant_frame = ttk.LabelFrame(right_frame, text="🤖 LLM Assistant - Describe Your Rental")
@@ -3241,6 +3764,7 @@ class CarRentalRecommenderApp:
         # Enhanced Record Form on the right
         form_frame = ttk.LabelFrame(right_frame, text="📝 Record Details")
         form_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self._record_form_path = str(form_frame) + "."
 
         # Create scrollable frame for the form with proper configuration
         # Remove scrolling: just use a direct frame in the form_frame
@@ -3575,8 +4099,7 @@ class CarRentalRecommenderApp:
             style="Accent.TButton",
         )
         add_btn.pack(side="left", padx=5, fill="x", expand=True)
-        # Bind Enter key to add record when form is focused
-        self.root.bind_all("<Return>", lambda e: self.add_record() if self.records_management_tab == self.notebook.select() else None)
+        # Enter adds the record when the form is focused; bound in _on_notebook_tab_changed
         
         update_btn = ttk.Button(
             primary_buttons,
@@ -3627,32 +4150,61 @@ class CarRentalRecommenderApp:
         # Record ID variable (hidden) for tracking which record is being edited
         self.current_record_index = None
 
-        # Enhanced trace callbacks to trigger auto-calculation with better performance
-        self.record_provider_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_distance_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_fuel_pumped_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_fuel_usage_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_total_cost_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_hours_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_kwh_used_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
-        )
-        self.record_duration_cost_var.trace_add(
-            "write", lambda *args: self.auto_update_fields()
+        # Field edits (re)schedule one debounced auto-calculation, so a burst of
+        # writes (typing, or filling the form from a record) recalculates once
+        for var in (
+            self.record_provider_var,
+            self.record_distance_var,
+            self.record_fuel_pumped_var,
+            self.record_fuel_usage_var,
+            self.record_total_cost_var,
+            self.record_hours_var,
+            self.record_kwh_used_var,
+            self.record_duration_cost_var,
+            self.fuel_price_var,
+        ):
+            var.trace_add("write", self._schedule_auto_update)
+
+    def _schedule_auto_update(self, *args):
+        """Run auto_update_fields once field writes pause for AUTO_UPDATE_DELAY_MS."""
+        # Writes made by auto_update_fields itself must not re-trigger it
+        if self._updating_fields:
+            return
+        if self._auto_update_after_id is not None:
+            self.root.after_cancel(self._auto_update_after_id)
+        self._auto_update_after_id = self.root.after(
+            AUTO_UPDATE_DELAY_MS, self._run_scheduled_auto_update
         )
-        self.fuel_price_var.trace_add("write", lambda *args: self.auto_update_fields())
+
+    def _run_scheduled_auto_update(self):
+        self._auto_update_after_id = None
+        # Edits that end where the last calculation left the form (a character typed
+        # and deleted, a value set to itself) have nothing to recalculate
+        if self._record_form_inputs() == self._auto_update_inputs:
+            return
+        self.auto_update_fields()
+
+    def _record_form_inputs(self):
+        """Raw values of every field auto_update_fields reads, as a comparable tuple."""
+        return (
+            self.record_provider_var.get(),
+            self.record_region_var.get(),
+            self.record_distance_var.get(),
+            self.record_hours_var.get(),
+            self.record_fuel_pumped_var.get(),
+            self.record_fuel_usage_var.get(),
+            self.record_total_cost_var.get(),
+            self.record_duration_cost_var.get(),
+            self.record_kwh_used_var.get(),
+            self.fuel_price_var.get(),
+            self.cost_per_kwh_var.get(),
+            self.apply_esso_sg_discount_var.get(),
+        )
+
+    def _on_record_form_return(self, event):
+        """Add the record when Enter is pressed inside the record form."""
+        if str(event.widget).startswith(self._record_form_path):
+            self.add_record()
 
     def update_records_status(self, message):
         """Update the status bar in records management tab"""
@@ -3661,8 +4213,6 @@ class CarRentalRecommenderApp:
 
     def set_today_date(self):
         """Set today's date in the date field"""
-        from datetime import datetime
-
         today = datetime.now().strftime("%d/%m/%Y")
         self.record_date_var.set(today)
 
@@ -3679,30 +4229,16 @@ class CarRentalRecommenderApp:
 
     def edit_selected_record(self):
         """Edit the currently selected record"""
-        selection = self.records_tree.selection()
-        if selection:
-            # Create a dummy event object to pass to on_record_select
-            class DummyEvent:
-                pass
-
-            event = DummyEvent()
-            self.on_record_select(event)
+        if self.records_tree.selection():
+            self.on_record_select()
         else:
             messagebox.showwarning("No Selection", "Please select a record to edit.")
 
     def auto_calculate_fuel_usage(self):
         """Auto-calculate fuel usage based on distance and consumption"""
         try:
-            distance = (
-                float(self.record_distance_var.get())
-                if self.record_distance_var.get()
-                else 0
-            )
-            consumption = (
-                float(self.record_consumption_var.get())
-                if self.record_consumption_var.get()
-                else 12.0
-            )
+            distance = _var_float(self.record_distance_var)
+            consumption = _var_float(self.record_consumption_var, 12.0)
 
             if distance > 0 and consumption > 0:
                 fuel_usage = distance / consumption
@@ -3722,69 +4258,27 @@ class CarRentalRecommenderApp:
         """Auto-calculate total cost based on available data"""
         try:
             # Get values
-            distance = (
-                float(self.record_distance_var.get())
-                if self.record_distance_var.get()
-                else 0
-            )
-            hours = (
-                float(self.record_hours_var.get()) if self.record_hours_var.get() else 0
-            )
+            distance = _var_float(self.record_distance_var)
+            hours = _var_float(self.record_hours_var)
             provider = self.record_provider_var.get()
-            fuel_pumped = (
-                float(self.record_fuel_pumped_var.get())
-                if self.record_fuel_pumped_var.get()
-                else 0
-            )
-            fuel_price = (
-                float(self.fuel_price_var.get()) if self.fuel_price_var.get() else 2.76
-            )
-
-            total_cost = 0
-
-            if provider == "Getgo(EV)":
-                # EV calculation
-                # Mileage cost at $0.29/km (no charging cost as it's provided free)
-                mileage_cost = distance * 0.29
-
-                # Duration cost (use user input or estimate)
-                user_duration_cost = (
-                    float(self.record_duration_cost_var.get())
-                    if self.record_duration_cost_var.get()
-                    else 0
-                )
-                if user_duration_cost > 0:
-                    duration_cost = user_duration_cost
-                else:
-                    duration_cost = hours * 8.0  # Fallback estimate of $8/hour
-
-                total_cost = mileage_cost + duration_cost
-            else:
-                # Regular car calculation
-                # Mileage cost
-                mileage_cost = 0
-                if provider == "Getgo":
-                    mileage_cost = distance * 0.39
-                elif provider == "Car Club":
-                    mileage_cost = distance * 0.33
-
-                # Duration cost (use user input or estimate)
-                user_duration_cost = (
-                    float(self.record_duration_cost_var.get())
-                    if self.record_duration_cost_var.get()
-                    else 0
-                )
-                if user_duration_cost > 0:
-                    duration_cost = user_duration_cost
-                else:
-                    duration_cost = hours * 8.0  # Fallback estimate of $8/hour
+            fuel_pumped = _var_float(self.record_fuel_pumped_var)
+            fuel_price = _var_float(self.fuel_price_var, 2.76)
 
-                # Fuel cost (Esso Singapore 23% discount applied only when toggle on and region Singapore)
-                region = (self.record_region_var.get() or "Singapore").strip()
-                factor = self._get_fuel_discount_factor(region)
-                fuel_cost = fuel_pumped * fuel_price * factor
+            # Duration cost (use user input or estimate)
+            duration_cost = _var_float(self.record_duration_cost_var)
+            if duration_cost <= 0:
+                duration_cost = hours * 8.0  # Fallback estimate of $8/hour
 
-                total_cost = mileage_cost + duration_cost + fuel_cost
+            # Esso Singapore 23% discount applied only when toggle on and region Singapore
+            region = (self.record_region_var.get() or "Singapore").strip()
+            total_cost = _estimate_trip_cost(
+                provider,
+                distance,
+                duration_cost,
+                fuel_pumped,
+                fuel_price,
+                self._get_fuel_discount_factor(region),
+            )
 
             self.record_total_cost_var.set(f"{total_cost:.2f}")
             messagebox.showinfo(
@@ -3867,44 +4361,22 @@ class CarRentalRecommenderApp:
             hours_val = float(hours) if hours else 0
             fuel_pumped_val = float(fuel_pumped) if fuel_pumped else 0
             fuel_price_val = float(fuel_price) if fuel_price else 2.51
-            
-            total_cost = 0
-            
-            if provider == "Getgo(EV)":
-                # EV calculation
-                mileage_cost = distance_val * 0.29
-                
-                if duration_cost:
-                    duration_cost_val = float(duration_cost)
-                elif historical_stats.get('avg_cost_per_hour'):
-                    duration_cost_val = hours_val * historical_stats['avg_cost_per_hour']
-                else:
-                    duration_cost_val = hours_val * 8.0
-                
-                total_cost = mileage_cost + duration_cost_val
-            else:
-                # Regular car calculation
-                mileage_cost = 0
-                if provider == "Getgo":
-                    mileage_cost = distance_val * 0.39
-                elif provider == "Car Club":
-                    mileage_cost = distance_val * 0.33
-                
-                if duration_cost:
-                    duration_cost_val = float(duration_cost)
-                elif historical_stats.get('avg_cost_per_hour'):
-                    duration_cost_val = hours_val * historical_stats['avg_cost_per_hour']
-                else:
-                    duration_cost_val = hours_val * 8.0
-
-                region = getattr(self, "record_region_var", None)
-                region = (region.get() or "Singapore").strip() if region else "Singapore"
-                factor = self._get_fuel_discount_factor(region)
-                fuel_cost = fuel_pumped_val * fuel_price_val * factor
 
-                total_cost = mileage_cost + duration_cost_val + fuel_cost
+            if duration_cost:
+                duration_cost_val = float(duration_cost)
+            elif historical_stats.get('avg_cost_per_hour'):
+                duration_cost_val = hours_val * historical_stats['avg_cost_per_hour']
+            else:
+                duration_cost_val = hours_val * 8.0
 
-            return total_cost
+            return _estimate_trip_cost(
+                provider,
+                distance_val,
+                duration_cost_val,
+                fuel_pumped_val,
+                fuel_price_val,
+                self._get_fuel_discount_factor(),
+            )
         except Exception:
             return None
 
@@ -3978,7 +4450,7 @@ class CarRentalRecommenderApp:
             if hasattr(self, 'ollama_model_var'):
                 model = self.ollama_model_var.get()
             else:
-                model = "llama3.1:3b"
+                model = self.DEFAULT_OLLAMA_MODEL
             
             payload = {"model": model, "prompt": prompt, "stream": False}
             response = requests.post(ollama_url, json=payload, timeout=30)
@@ -4261,9 +4733,14 @@ class CarRentalRecommenderApp:
     def calculate_all_formulas(self):
         """Calculate all Excel formulas for the current record"""
         try:
+            if self._record_form_inputs() == self._auto_update_inputs:
+                messagebox.showinfo(
+                    "Calculation Complete",
+                    "All formulas are already up to date.",
+                )
+                return
+            # Also runs the Excel formulas and the fuel economy comparison
             self.auto_update_fields()
-            self.calculate_excel_formulas_for_current_record()
-            self.update_fuel_economy_comparison()
             messagebox.showinfo(
                 "Calculation Complete",
                 "All formulas have been calculated successfully!",
@@ -4744,6 +5221,89 @@ class CarRentalRecommenderApp:
                 lines.append(f"  • {e}")
         messagebox.showinfo("Data quality report", "\n".join(lines))
 
+    def _cost_analysis_cache_key(self, region):
+        """Cheap identity of self.df for reusing its cost analysis.
+
+        Uses the DataFrame object, its row count, its first and last Date
+        and the region instead of hashing the data.
+        """
+        df = self.df
+        dates = None
+        if "Date" in df.columns and len(df.index):
+            dates = (df["Date"].iat[0], df["Date"].iat[-1])
+        return (id(df), len(df.index), dates, region)
+
+    def _set_cost_analysis(self, cost_analysis, region, data_changed=True):
+        """Store cost_analysis as the analysis of the current self.df.
+
+        Args:
+            data_changed: False when only the analysis of unchanged data is stored,
+                which keeps the core's data-derived caches
+        """
+        self.cost_analysis = cost_analysis
+        self._cost_analysis_key = self._cost_analysis_cache_key(region)
+        self._cost_analysis_generation += 1
+        # Every data change passes through here, including in-place record edits
+        self._analysis_chart_key = None
+        self._records_tree_key = None
+        # Cached chart views keep their axes but must redraw from the new data
+        for entry in self._analysis_views.values():
+            entry[1] = None
+        if data_changed:
+            clear_recommendation_cache()
+            clear_historical_prompt_cache()
+
+    def _refresh_cost_analysis(self):
+        """Rebuild the cost analysis after self.df was replaced or edited.
+
+        Views of the old data are invalidated at once; the analysis is built on a
+        worker thread and stored only if the analysis was not set again meanwhile.
+        Until it lands, recommendations build their own (see cost_analysis_key).
+        """
+        region = self._get_current_region()
+        self._set_cost_analysis(None, region)
+        key = self._cost_analysis_key
+        self._cost_analysis_key = None
+        generation = self._cost_analysis_generation
+        df = self.df
+
+        def _build_in_thread():
+            try:
+                cost_analysis = create_complete_cost_analysis(df, region=region)
+            except Exception as e:
+                print(f"Cost analysis failed: {e}")
+                return
+
+            def _store():
+                if generation == self._cost_analysis_generation:
+                    self.cost_analysis = cost_analysis
+                    self._cost_analysis_key = key
+
+            self.root.after(0, _store)
+
+        threading.Thread(target=_build_in_thread, daemon=True).start()
+
+    def _load_data_worker(self, file_path, region):
+        """Run the cleaning pipeline and cost analysis off the Tk thread.
+
+        Returns:
+            tuple: (df, cost_analysis, quality_report)
+        """
+        cached = _read_cleaned_cache(file_path)
+        if cached is not None:
+            df, quality_report = cached
+            df = _prepare_rental_frame(df)
+        else:
+            # Run automated data cleaning pipeline (schema -> load -> enhance -> deduplicate)
+            stamp = _source_stamp(file_path)
+            df, quality_report = run_cleaning_pipeline(file_path)
+            df = _prepare_rental_frame(df)
+            _write_cleaned_cache(file_path, stamp, df, quality_report)
+        cost_analysis = create_complete_cost_analysis(df, region=region)
+        # Log pipeline report for data management visibility
+        print("[Data cleaning pipeline]", quality_report)
+        return df, cost_analysis, quality_report
+
     def load_data_file(self, file_path, show_dialog=True):
         """Load and process data from file asynchronously"""
         if not file_path or not os.path.exists(file_path):
@@ -4751,32 +5311,37 @@ class CarRentalRecommenderApp:
             self.add_error_message(error_msg)
             messagebox.showerror("Error", error_msg)
             return
-        
+        if self._loading_data:
+            # A load is already running; ignore rapid repeat Browse/Load clicks
+            return
+        self._loading_data = True
+        file_name = os.path.basename(file_path)
+
+        # Widgets are only touched on the Tk thread; the worker does pandas work only
+        loading = None
+        if show_dialog:
+            loading = LoadingDialog(self.root, "Loading Data", f"Loading and processing {file_name}...")
+            loading.show()
+        self.status_var.set(f"Loading {file_name}...")
+        region = self._get_current_region()
+
         def _load_in_thread():
-            loading = None
-            if show_dialog:
-                loading = LoadingDialog(self.root, "Loading Data", f"Loading and processing {os.path.basename(file_path)}...")
-                loading.show()
-            
             try:
-                # Run automated data cleaning pipeline (schema -> load -> enhance -> deduplicate)
-                df, quality_report = run_cleaning_pipeline(file_path)
-                cost_analysis = create_complete_cost_analysis(df, region=self._get_current_region())
-                self._last_quality_report = quality_report
-                # Log pipeline report for data management visibility
-                print("[Data cleaning pipeline]", quality_report)
+                df, cost_analysis, quality_report = self._load_data_worker(file_path, region)
                 
                 def _update_ui():
+                    self._loading_data = False
                     if loading:
                         loading.hide()
                     self.df = df
-                    self.cost_analysis = cost_analysis
+                    self._set_cost_analysis(cost_analysis, region)
+                    self._last_quality_report = quality_report
                     
                     # Update file path display
-                    self.data_file_var.set(os.path.basename(file_path))
+                    self.data_file_var.set(file_name)
                     self.file_path_var.set(file_path)
                     
-                    success_msg = f"Data loaded successfully from {os.path.basename(file_path)}"
+                    success_msg = f"Data loaded successfully from {file_name}"
                     # Append pipeline summary (rows, duplicates removed, schema)
                     r_in = quality_report.get("rows_in", 0)
                     r_out = quality_report.get("rows_out", 0)
@@ -4788,6 +5353,7 @@ class CarRentalRecommenderApp:
                     if not quality_report.get("schema_valid", True):
                         success_msg += " (schema warnings — some columns missing)"
                     self.add_success_message(success_msg)
+                    self.status_var.set(success_msg)
                     if show_dialog:
                         messagebox.showinfo("Success", success_msg)
 
@@ -4805,9 +5371,11 @@ class CarRentalRecommenderApp:
                 
             except Exception as e:
                 def _update_ui_error():
+                    self._loading_data = False
                     if loading:
                         loading.hide()
                     error_msg = f"Failed to load data: {str(e)}"
+                    self.status_var.set(error_msg)
                     self.add_error_message(error_msg)
                     messagebox.showerror("Error", error_msg)
                 self.root.after(0, _update_ui_error)
@@ -4838,12 +5406,13 @@ class CarRentalRecommenderApp:
             return
 
         try:
-            # Load the file for preview
-            preview_df = load_data(file_path)
+            # Only the previewed rows are read; the full record count follows from a thread
+            preview_df = load_data(file_path, nrows=10)
+            file_name = os.path.basename(file_path)
 
             # Create preview window
             preview_window = tk.Toplevel(self.root)
-            preview_window.title(f"File Preview - {os.path.basename(file_path)}")
+            preview_window.title(f"File Preview - {file_name}")
             preview_window.geometry("800x600")
             preview_window.resizable(True, True)
 
@@ -4855,12 +5424,27 @@ class CarRentalRecommenderApp:
             info_frame = ttk.LabelFrame(preview_frame, text="File Information")
             info_frame.pack(fill=tk.X, pady=(0, 10))
 
-            ttk.Label(info_frame, text=f"File: {os.path.basename(file_path)}").pack(
-                anchor=tk.W, padx=5, pady=2
-            )
-            ttk.Label(info_frame, text=f"Records: {len(preview_df)}").pack(
+            ttk.Label(info_frame, text=f"File: {file_name}").pack(
                 anchor=tk.W, padx=5, pady=2
             )
+            records_label = ttk.Label(info_frame, text="Records: counting...")
+            records_label.pack(anchor=tk.W, padx=5, pady=2)
+
+            def _count_records():
+                try:
+                    count = len(pd.read_csv(file_path, usecols=[0]))
+                except Exception as e:
+                    print(f"Could not count records in {file_path}: {e}")
+                    return
+
+                def _show_count():
+                    # The preview window may have been closed meanwhile
+                    if records_label.winfo_exists():
+                        records_label.config(text=f"Records: {count}")
+
+                self.root.after(0, _show_count)
+
+            threading.Thread(target=_count_records, daemon=True).start()
             ttk.Label(info_frame, text=f"Columns: {len(preview_df.columns)}").pack(
                 anchor=tk.W, padx=5, pady=2
             )
@@ -4904,20 +5488,10 @@ class CarRentalRecommenderApp:
             y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
 
-            # Add data to treeview (first 10 rows)
-            for idx, row in preview_df.head(10).iterrows():
-                values = []
-                for col in columns:
-                    value = row[col]
-                    if pd.isna(value):
-                        values.append("")
-                    elif isinstance(value, (int, float)):
-                        values.append(
-                            f"{value:.2f}" if isinstance(value, float) else str(value)
-                        )
-                    else:
-                        values.append(str(value))
-                preview_tree.insert("", tk.END, values=values)
+            # Add data to treeview (first 10 rows), formatted a column at a time
+            _tree_insert_rows(
+                preview_tree, [("", values) for values in _preview_rows(preview_df.head(10))]
+            )
 
             # Close button
             ttk.Button(
@@ -4936,24 +5510,24 @@ class CarRentalRecommenderApp:
             return
 
         upload_mode = self.upload_mode_var.get()
+        file_name = os.path.basename(file_path)
 
         try:
             # Run cleaning pipeline on the new file
             new_df, _ = run_cleaning_pipeline(file_path)
+            new_df = _prepare_rental_frame(new_df)
 
             if upload_mode == "Replace Current Data":
                 # Replace current data
                 self.df = new_df
-                self.cost_analysis = create_complete_cost_analysis(self.df, region=self._get_current_region())
+                self._refresh_cost_analysis()
 
                 # Update the main data file path
                 self.data_file_var.set(file_path)
                 if hasattr(self, "file_path_var"):
                     self.file_path_var.set(file_path)
 
-                success_msg = (
-                    f"Data replaced successfully with {os.path.basename(file_path)}"
-                )
+                success_msg = f"Data replaced successfully with {file_name}"
                 self.upload_status_var.set(success_msg)
                 messagebox.showinfo("Success", success_msg)
 
@@ -4961,21 +5535,17 @@ class CarRentalRecommenderApp:
                 if self.df is None or self.df.empty:
                     # If no current data, just load the new file
                     self.df = new_df
-                    self.cost_analysis = create_complete_cost_analysis(self.df, region=self._get_current_region())
+                    self._refresh_cost_analysis()
                     self.data_file_var.set(file_path)
                     if hasattr(self, "file_path_var"):
                         self.file_path_var.set(file_path)
 
-                    success_msg = (
-                        f"Data loaded successfully from {os.path.basename(file_path)}"
-                    )
+                    success_msg = f"Data loaded successfully from {file_name}"
                     self.upload_status_var.set(success_msg)
                     messagebox.showinfo("Success", success_msg)
                 else:
-                    # Combine current and new data
-                    combined_df = pd.concat([self.df, new_df], ignore_index=True)
-
-                    # Remove duplicates based on key columns if they exist
+                    # Drop new rows whose key columns match a current record or an
+                    # earlier row of the new file; the current data is not rescanned
                     key_columns = [
                         "Date",
                         "Car model",
@@ -4984,22 +5554,35 @@ class CarRentalRecommenderApp:
                         "Rental hour",
                     ]
                     existing_columns = [
-                        col for col in key_columns if col in combined_df.columns
+                        col
+                        for col in key_columns
+                        if col in self.df.columns and col in new_df.columns
                     ]
 
                     if existing_columns:
-                        # Remove exact duplicates
-                        initial_count = len(combined_df)
-                        combined_df = combined_df.drop_duplicates(
-                            subset=existing_columns, keep="first"
-                        )
-                        final_count = len(combined_df)
-                        duplicates_removed = initial_count - final_count
+                        new_keys = new_df[existing_columns]
+                        duplicate = pd.MultiIndex.from_frame(new_keys).isin(
+                            pd.MultiIndex.from_frame(self.df[existing_columns])
+                        ) | new_keys.duplicated(keep="first").to_numpy()
+                        to_add = new_df[~duplicate]
                     else:
-                        duplicates_removed = 0
-
-                    self.df = combined_df
-                    self.cost_analysis = create_complete_cost_analysis(self.df, region=self._get_current_region())
+                        to_add = new_df
+                    duplicates_removed = len(new_df) - len(to_add)
+
+                    if not to_add.empty:
+                        # Line columns up once when the upload only reorders them, so
+                        # concat appends blocks without a union pass. Missing columns are
+                        # left to concat, which keeps the existing column's dtype.
+                        if (
+                            not to_add.columns.equals(self.df.columns)
+                            and len(to_add.columns) == len(self.df.columns)
+                            and to_add.columns.isin(self.df.columns).all()
+                        ):
+                            to_add = to_add[self.df.columns]
+                        self.df = _prepare_rental_frame(
+                            pd.concat([self.df, to_add], ignore_index=True, sort=False)
+                        )
+                        self._refresh_cost_analysis()
 
                     # Update status
                     new_records = len(new_df)
@@ -5048,10 +5631,7 @@ class CarRentalRecommenderApp:
 
             if file_path:
                 # Save the data
-                if file_path.endswith(".xlsx"):
-                    self.df.to_excel(file_path, index=False)
-                else:
-                    self.df.to_csv(file_path, index=False)
+                _export_table(self.df, file_path)
 
                 # Update the main data file path to the new saved file
                 self.data_file_var.set(file_path)
@@ -5088,8 +5668,7 @@ class CarRentalRecommenderApp:
             if hasattr(self, "results_text"):
                 self.results_text.delete(1.0, tk.END)
             if hasattr(self, "scenarios_tree"):
-                for item in self.scenarios_tree.get_children():
-                    self.scenarios_tree.delete(item)
+                self.scenarios_tree.delete(*self.scenarios_tree.get_children())
         elif tab_name == "Excel Formulas":
             # Clear previous results when switching to Excel formulas tab
             if hasattr(self, "comparison_text"):
@@ -5102,9 +5681,6 @@ class CarRentalRecommenderApp:
             if hasattr(self, "message_entry"):
                 self.message_entry.focus_set()
 
-            # Force update the display
-            self.root.update_idletasks()
-
             # print("Chat interface initialized and ready for interaction")
         except Exception as e:
             print(f"Warning: Could not initialize chat interface: {e}")
@@ -5178,10 +5754,11 @@ The LLM analyzes your historical data with your specific profile in mind, provid
         item = selection[0]
         values = self.results_tree.item(item, "values")
 
-        if len(values) < 6:
+        if len(values) < 5:
             return
 
-        provider, car_model, cost, method, confidence, display_reasoning = values[:6]
+        provider, car_model, cost, method, confidence = values[:5]
+        display_reasoning = self.results_tree.set(item, "reasoning")
 
         # Try to get the full reasoning from the stored data
         full_reasoning = self.results_tree.set(item, "full_reasoning")
@@ -5244,11 +5821,114 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         )
         close_button.pack(pady=10)
 
+    def _ensure_cost_chart(self):
+        """Create the Cost Comparison figure and canvas on first use."""
+        if self._chart_ready:
+            return
+        self._chart_placeholder.destroy()
+        self.fig, self.ax = plt.subplots(figsize=(5, 3), dpi=100)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._init_cost_chart()
+        self._chart_ready = True
+
+    def _init_cost_chart(self):
+        """Apply the static Cost Comparison styling once; bars and labels are blitted over it."""
+        ax = self.ax
+        ax.set_title("Cost Comparison", fontsize=13, pad=8)
+        ax.set_xlabel("Estimated Cost ($)", fontsize=10)
+        ax.tick_params(axis="y", labelsize=10)
+        ax.tick_params(axis="x", labelsize=9)
+        ax.spines["right"].set_visible(False)
+        ax.spines["top"].set_visible(False)
+        ax.grid(axis="x", linestyle="--", alpha=0.5)
+
+        # Custom legend
+        from matplotlib.patches import Patch
+        legend_elements = [
+            Patch(facecolor=color, label=label) for label, color in _CHART_LEGEND
+        ]
+        ax.legend(handles=legend_elements, loc="upper right", fontsize=9, frameon=False)
+
+        self._bars = []
+        self._bar_labels = []
+        self._bar_keys = None
+        self._chart_bg = None
+        # Any full draw (first show, window resize) re-captures the background
+        self.canvas.mpl_connect("draw_event", self._on_cost_chart_draw)
+
+    def _on_cost_chart_draw(self, event):
+        """Cache the static chart background and paint the animated bars on top."""
+        self._chart_bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_cost_chart_artists()
+
+    def _draw_cost_chart_artists(self):
+        """Render the animated bar and value-label artists onto the canvas."""
+        for artist in chain(self._bars, self._bar_labels):
+            self.ax.draw_artist(artist)
+
+    def _set_cost_chart_bars(self, labels, costs, colors):
+        """Update the cost bars, blitting when the chart layout is unchanged.
+
+        Args:
+            labels (list): Y-axis labels, one per bar
+            costs (list): Bar widths
+            colors (list): Bar face colours
+        """
+        ax = self.ax
+        max_cost = max(costs, default=0)
+        x_max = max_cost * 1.15
+        x_limit = ax.get_xlim()[1]
+        if (
+            self._chart_bg is not None
+            and tuple(labels) == self._bar_keys
+            and 0 < x_max <= x_limit
+            and x_max >= x_limit * 0.8
+        ):
+            # Same bars and scale: update artists in place and blit them
+            for bar, text, cost, color in zip(self._bars, self._bar_labels, costs, colors):
+                bar.set_width(cost)
+                bar.set_color(color)
+                text.set_x(cost + max_cost * 0.01)
+                text.set_text(f"${cost:.2f}")
+            self.canvas.restore_region(self._chart_bg)
+            self._draw_cost_chart_artists()
+            self.canvas.blit(self.fig.bbox)
+            return
+
+        # Layout changed: rebuild the artists and do a single full draw
+        for artist in chain(self._bars, self._bar_labels):
+            artist.remove()
+        positions = range(len(labels))
+        self._bars = list(ax.barh(positions, costs, color=colors, height=0.45))
+        self._bar_labels = [
+            ax.text(
+                cost + max_cost * 0.01,
+                pos,
+                f"${cost:.2f}",
+                ha="left",
+                va="center",
+                fontsize=10,
+            )
+            for pos, cost in zip(positions, costs)
+        ]
+        for artist in chain(self._bars, self._bar_labels):
+            artist.set_animated(True)
+        ax.set_yticks(list(positions))
+        ax.set_yticklabels(labels)
+        ax.set_ylim(-0.5, max(len(labels), 1) - 0.5)
+        ax.set_xlim(0, x_max or 1)
+        self._bar_keys = tuple(labels)
+        self.fig.tight_layout()
+        self.canvas.draw()
+
     def show_recommendation_chart(self, recommendations=None):
         """Display a horizontal bar chart comparing recommendation costs, optimized for clarity and mobile-friendly layout."""
-        self.ax.clear()
+        if not recommendations and not self._chart_ready:
+            return
+        self._ensure_cost_chart()
         if not recommendations:
-            self.canvas.draw()
+            self._set_cost_chart_bars([], [], [])
             return
 
         # Extract and limit data for readability
@@ -5271,62 +5951,41 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         methods = [method for _, _, _, method in data]
 
         # Color mapping for methods
-        method_colors = {
-            "Ollama Analysis": "#28a745",
-            "ML Prediction": "#4a90e2",
-            "Historical Analysis": "#f39c12",
-        }
-        colors = [method_colors.get(m, "#95a5a6") for m in methods]
+        colors = [_CHART_METHOD_COLORS.get(m, _CHART_DEFAULT_COLOR) for m in methods]
 
-        # Plot horizontal bar chart
-        bars = self.ax.barh(labels, costs, color=colors, height=0.45)
-
-        # Add value labels to bars
-        for bar in bars:
-            width = bar.get_width()
-            self.ax.text(
-                width + max(costs) * 0.01,
-                bar.get_y() + bar.get_height() / 2,
-                f"${width:.2f}",
-                ha="left",
-                va="center",
-                fontsize=10,
-            )
+        self._set_cost_chart_bars(labels, costs, colors)
 
-        # Improve chart aesthetics for mobile/small screens
-        self.ax.set_title("Cost Comparison", fontsize=13, pad=8)
-        self.ax.set_xlabel("Estimated Cost ($)", fontsize=10)
-        self.ax.tick_params(axis="y", labelsize=10)
-        self.ax.tick_params(axis="x", labelsize=9)
-        self.ax.spines["right"].set_visible(False)
-        self.ax.spines["top"].set_visible(False)
-        self.ax.grid(axis="x", linestyle="--", alpha=0.5)
+    def _mark_settings_dirty(self, *_):
+        """Schedule a settings write, coalescing rapid edits into one flush."""
+        self._settings_dirty = True
+        if self._settings_after_id is not None:
+            self.root.after_cancel(self._settings_after_id)
+        self._settings_after_id = self.root.after(
+            SETTINGS_FLUSH_DELAY_MS, self._flush_settings
+        )
 
-        # Custom legend
-        from matplotlib.patches import Patch
-        legend_labels = [
-            ("Ollama Analysis", "#28a745"),
-            ("ML Prediction", "#4a90e2"),
-            ("Historical Analysis", "#f39c12"),
-            ("Default Pricing", "#95a5a6"),
-        ]
-        legend_elements = [Patch(facecolor=color, label=label) for label, color in legend_labels]
-        self.ax.legend(handles=legend_elements, loc="upper right", fontsize=9, frameon=False)
+    def _flush_settings(self):
+        """Write settings if anything changed since the last save."""
+        self._settings_after_id = None
+        if self._settings_dirty:
+            self.save_settings()
 
-        plt.tight_layout()
-        self.canvas.draw()
     def save_settings(self):
         """Save current settings to a JSON file"""
         settings_file = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "settings.json"
         )
+        tmp_file = settings_file + ".tmp"
         try:
             # Update user profile in settings before saving
             self.settings["user_age"] = self.user_age
             self.settings["user_experience_years"] = self.user_experience_years
             self.settings["apply_esso_sg_discount"] = self.apply_esso_sg_discount_var.get()
-            with open(settings_file, "w") as f:
-                json.dump(self.settings, f)
+            # Write to a temp file and swap it in so a crash never leaves a torn file
+            with open(tmp_file, "w") as f:
+                f.write(json.dumps(self.settings, separators=(",", ":")))
+            os.replace(tmp_file, settings_file)
+            self._settings_dirty = False
             print(f"Settings saved to {settings_file}")
         except Exception as e:
             print(f"Error saving settings: {str(e)}")
@@ -5382,70 +6041,77 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         if hasattr(self, "auto_update_fields"):
             self.auto_update_fields()
 
-    def refresh_records(self):
-        """Refresh the records list in the treeview"""
-        if self.df is None:
-            # Clear and show empty state
-            for item in self.records_tree.get_children():
-                self.records_tree.delete(item)
-            self.records_tree.insert("", "end", values=("No data loaded", "", "", "", "", "", "", ""))
-            return
+    def _records_tree_rows(self, df):
+        """Format df into (iid, values) rows for records_tree in one column-wise pass.
 
-        # Clear existing records
-        for item in self.records_tree.get_children():
-            self.records_tree.delete(item)
+        Returns:
+            list: (iid, values) tuples in DataFrame order
+        """
+        if "Date" in df.columns:
+            dates = pd.to_datetime(df["Date"], errors="coerce")
+        else:
+            dates = pd.Series(pd.NaT, index=df.index)
+        return list(
+            zip(
+                df.index.astype(str),
+                zip(
+                    dates.dt.strftime("%d/%m/%Y").fillna("").tolist(),
+                    _text_column(df, "Car model"),
+                    _text_column(df, "Car Cat"),
+                    _fixed_column(df, "Distance (KM)"),
+                    _fixed_column(df, "Rental hour"),
+                    _fixed_column(df, "Total", prefix="$"),
+                    _fixed_column(df, "Estimated fuel usage"),
+                    _fixed_column(df, "Consumption (KM/L)"),
+                ),
+            )
+        )
 
-        # Check if dataframe is empty
-        if self.df.empty:
-            self.records_tree.insert("", "end", values=("No records available", "", "", "", "", "", "", ""))
+    def _fill_records_tree(self, rows, empty_message=None):
+        """Replace the records_tree contents with rows, or a single placeholder row."""
+        self._records_tree_key = None
+        self._records_tree_unfiltered = False
+        tree = self.records_tree
+        tree.delete(*tree.get_children())
+        self._records_tree_rows_all = rows
+        self._records_tree_loaded = 0
+        if not rows and empty_message:
+            tree.insert("", "end", values=(empty_message, "", "", "", "", "", "", ""))
             return
+        self._insert_records_page()
 
-        # Add records from dataframe
-        for idx, row in self.df.iterrows():
-            try:
-                # Format date for display
-                date_str = (
-                    row["Date"].strftime("%d/%m/%Y") if pd.notna(row["Date"]) else ""
-                )
+    def _insert_records_page(self):
+        """Append the next page of pending rows to records_tree."""
+        start = self._records_tree_loaded
+        page = self._records_tree_rows_all[start : start + _RECORDS_TREE_PAGE_ROWS]
+        self._records_tree_loaded = start + len(page)
+        _tree_insert_rows(self.records_tree, page)
 
-                # Add record to tree with index as ID
-                self.records_tree.insert(
-                    "",
-                    "end",
-                    iid=str(idx),
-                    values=(
-                        date_str,
-                        row["Car model"] if pd.notna(row["Car model"]) else "",
-                        row["Car Cat"] if pd.notna(row["Car Cat"]) else "",
-                        (
-                            f"{row['Distance (KM)']:.2f}"
-                            if pd.notna(row["Distance (KM)"])
-                            else ""
-                        ),
-                        (
-                            f"{row['Rental hour']:.2f}"
-                            if pd.notna(row["Rental hour"])
-                            else ""
-                        ),
-                        f"${row['Total']:.2f}" if pd.notna(row["Total"]) else "",
-                        (
-                            f"{row['Estimated fuel usage']:.2f}"
-                            if pd.notna(row["Estimated fuel usage"])
-                            else ""
-                        ),
-                        (
-                            f"{row['Consumption (KM/L)']:.2f}"
-                            if pd.notna(row["Consumption (KM/L)"])
-                            else ""
-                        ),
-                    ),
-                )
-            except Exception as e:
-                # Skip problematic records
-                print(f"Error adding record {idx}: {e}")
-                continue
+    def _on_records_tree_yscroll(self, first, last):
+        """Update the scrollbar and load another page once the view nears the last row."""
+        self.records_y_scrollbar.set(first, last)
+        if self._records_tree_loaded < len(self._records_tree_rows_all) and float(last) >= 0.9:
+            self._insert_records_page()
 
-    def on_record_select(self, event):
+    def refresh_records(self):
+        """Refresh the records list in the treeview"""
+        if self.df is None:
+            self._fill_records_tree([], "No data loaded")
+            return
+        # Switching to the Records tab refreshes too; skip the rebuild when the tree
+        # already lists every row of this DataFrame
+        key = (id(self.df), len(self.df.index))
+        if key == self._records_tree_key:
+            return
+        rows = self._records_tree_rows(self.df)
+        # An upload or reload that changes nothing visible formats to the same rows;
+        # keep the existing items instead of deleting and re-inserting them
+        if not (rows and self._records_tree_unfiltered and rows == self._records_tree_rows_all):
+            self._fill_records_tree(rows, "No records available")
+            self._records_tree_unfiltered = True
+        self._records_tree_key = key
+
+    def on_record_select(self, event=None):
         """Handle record selection in the treeview"""
         selected_items = self.records_tree.selection()
         if not selected_items:
@@ -5894,7 +6560,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             self.df = pd.concat([self.df, pd.DataFrame([record])], ignore_index=True)
 
             # Refresh the cost analysis
-            self.cost_analysis = create_complete_cost_analysis(self.df, region=self._get_current_region())
+            self._refresh_cost_analysis()
 
             # Refresh the records list
             self.refresh_records()
@@ -5961,7 +6627,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
                 self.df.at[self.current_record_index, key] = value
 
         # Refresh the cost analysis
-        self.cost_analysis = create_complete_cost_analysis(self.df, region=self._get_current_region())
+        self._refresh_cost_analysis()
 
         # Refresh the records list
         self.refresh_records()
@@ -5999,7 +6665,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         self.df = self.df.drop(idx).reset_index(drop=True)
 
         # Refresh the cost analysis
-        self.cost_analysis = create_complete_cost_analysis(self.df, region=self._get_current_region())
+        self._refresh_cost_analysis()
 
         # Refresh the records list
         self.refresh_records()
@@ -6043,10 +6709,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
 
         try:
             # Save to file
-            if file_path.endswith(".xlsx"):
-                self.df.to_excel(file_path, index=False)
-            else:
-                self.df.to_csv(file_path, index=False)
+            _export_table(self.df, file_path)
 
             messagebox.showinfo(
                 "Export Complete", f"Records exported successfully to {file_path}"
@@ -6055,78 +6718,41 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export records: {str(e)}")
 
+    def _schedule_filter_records(self, event=None):
+        """Re-filter records once typing pauses, so a burst of keystrokes filters once."""
+        if self._filter_after_id is not None:
+            self.root.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.root.after(
+            SEARCH_DEBOUNCE_MS, self._run_scheduled_filter_records
+        )
+
+    def _run_scheduled_filter_records(self):
+        self._filter_after_id = None
+        self.filter_records()
+
     def filter_records(self, event=None):
         """Filter records based on search text"""
         if self.df is None or self.df.empty:
-            # Clear and show empty state
-            for item in self.records_tree.get_children():
-                self.records_tree.delete(item)
-            if self.df is None:
-                self.records_tree.insert("", "end", values=("No data loaded", "", "", "", "", "", "", ""))
-            else:
-                self.records_tree.insert("", "end", values=("No records available", "", "", "", "", "", "", ""))
+            self.refresh_records()
             return
 
         search_text = self.search_var.get().lower()
 
-        # Clear existing records
-        for item in self.records_tree.get_children():
-            self.records_tree.delete(item)
-
         # If search text is empty, show all records
         if not search_text:
             self.refresh_records()
             return
 
-        # Add matching records
-        match_count = 0
-        for idx, row in self.df.iterrows():
-            # Check if search text appears in any of the displayed columns
-            date_str = row["Date"].strftime("%d/%m/%Y") if pd.notna(row["Date"]) else ""
-            car_model = str(row["Car model"]) if pd.notna(row["Car model"]) else ""
-            provider = str(row["Car Cat"]) if pd.notna(row["Car Cat"]) else ""
-
-            if (
-                search_text in date_str.lower()
-                or search_text in car_model.lower()
-                or search_text in provider.lower()
-            ):
-                self.records_tree.insert(
-                    "",
-                    "end",
-                    iid=str(idx),
-                    values=(
-                        date_str,
-                        car_model,
-                        provider,
-                        (
-                            f"{row['Distance (KM)']:.2f}"
-                            if pd.notna(row["Distance (KM)"])
-                            else ""
-                        ),
-                        (
-                            f"{row['Rental hour']:.2f}"
-                            if pd.notna(row["Rental hour"])
-                            else ""
-                        ),
-                        f"${row['Total']:.2f}" if pd.notna(row["Total"]) else "",
-                        (
-                            f"{row['Estimated fuel usage']:.2f}"
-                            if pd.notna(row["Estimated fuel usage"])
-                            else ""
-                        ),
-                        (
-                            f"{row['Consumption (KM/L)']:.2f}"
-                            if pd.notna(row["Consumption (KM/L)"])
-                            else ""
-                        ),
-                    ),
-                )
-                match_count += 1
-
-        # Show empty state if no matches found
-        if match_count == 0:
-            self.records_tree.insert("", "end", values=(f"No records found matching '{search_text}'", "", "", "", "", "", "", ""))
+        # Match against the displayed date, car model and provider columns
+        matches = [
+            (iid, values)
+            for iid, values in self._records_tree_rows(self.df)
+            if search_text in values[0].lower()
+            or search_text in values[1].lower()
+            or search_text in values[2].lower()
+        ]
+        self._fill_records_tree(matches, f"No records found matching '{search_text}'")
+        match_count = len(matches)
 
         # Update status
         self.status_var.set(f"Found {match_count} matching record{'s' if match_count != 1 else ''} for '{search_text}'")
@@ -6749,10 +7375,10 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         self.pref_region_label = ttk.Label(
             region_frame,
             text="Analysis and recommendations for region: Singapore",
-            font=("Segoe UI", 9),
+            font=_FONT_SMALL,
         )
         self.pref_region_label.pack(side="left", padx=(10, 0))
-        self.pref_region_var.trace_add("write", lambda *a: self._update_pref_region_label())
+        self.pref_region_var.trace_add("write", self._update_pref_region_label)
 
         # Profile editing section
         edit_profile_frame = ttk.LabelFrame(parent, text="Edit Profile", padding=10)
@@ -6951,7 +7577,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             if hasattr(self, 'ollama_model_var'):
                 ollama_model = self.ollama_model_var.get()
             else:
-                ollama_model = "llama3.1:3b"  # Default fallback
+                ollama_model = self.DEFAULT_OLLAMA_MODEL  # Default fallback
 
             # Filter by selected region so analysis is for one region only (Singapore or Malaysia)
             region = self.pref_region_var.get() if hasattr(self, "pref_region_var") else "Singapore"
@@ -7177,8 +7803,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             is_weekend = self.pref_weekend_var.get()
 
             # Clear previous results
-            for item in self.pref_recs_tree.get_children():
-                self.pref_recs_tree.delete(item)
+            self.pref_recs_tree.delete(*self.pref_recs_tree.get_children())
             
             # Clear range displays
             self.range_info_text.config(state=tk.NORMAL)
@@ -7527,8 +8152,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             day_type = self.calc_day_type_var.get()
 
             # Clear previous results
-            for item in self.calc_results_tree.get_children():
-                self.calc_results_tree.delete(item)
+            self.calc_results_tree.delete(*self.calc_results_tree.get_children())
 
             # Update pricing data from current inputs (including SoCar)
             self.update_pricing_data_from_inputs()
@@ -7788,8 +8412,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
     def refresh_saved_data(self):
         """Refresh the saved data table with calculator-generated trips"""
         try:
-            for item in self.saved_data_tree.get_children():
-                self.saved_data_tree.delete(item)
+            self.saved_data_tree.delete(*self.saved_data_tree.get_children())
             if self.df is not None and not self.df.empty:
                 calculator_trips = self.df[
                     self.df["Car model"] == "Calculator Generated"
@@ -8059,7 +8682,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         if model_name:
             model_name = model_name.get()
         else:
-            model_name = "llama3.1:3b"  # Use faster model by default
+            model_name = self.DEFAULT_OLLAMA_MODEL  # Use faster model by default
 
         payload = {
             "model": model_name,
@@ -8696,8 +9319,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
 
             # Clear previous results and breakdowns
             self.results_text.delete(1.0, tk.END)
-            for item in self.scenarios_tree.get_children():
-                self.scenarios_tree.delete(item)
+            self.scenarios_tree.delete(*self.scenarios_tree.get_children())
             for label in self.breakdown_labels.values():
                 label.config(text="$0.00")
             self.cost_planning_ax.clear()
@@ -8834,18 +9456,8 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             self.cost_planning_fig.clf()
             self.cost_planning_ax = self.cost_planning_fig.add_subplot(111)
 
-            # Dynamically resize the figure to match the frame size, but never exceed it
-            widget = self.cost_planning_canvas.get_tk_widget()
-            widget.update_idletasks()
-            width = widget.winfo_width()
-            height = widget.winfo_height()
-            # Convert from pixels to inches for matplotlib (assuming 100 dpi)
-            dpi = self.cost_planning_fig.get_dpi()
-            # Set a minimum size to avoid zero division, but never exceed the widget size
-            min_in = 2
-            fig_width = max(min_in, width / dpi) if width > 0 else min_in
-            fig_height = max(min_in, height / dpi) if height > 0 else min_in
-            self.cost_planning_fig.set_size_inches(fig_width, fig_height, forward=True)
+            # The Tk canvas resizes the figure to its widget on every <Configure>,
+            # so no forced geometry pass is needed here to keep it inside the frame
 
             if calc_type == "duration_based":
                 # Plot cost vs mileage for fixed duration
@@ -9392,15 +10004,9 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             duration = None
             mileage = None
             if calc_type == "duration_based":
-                duration = (
-                    float(self.planning_duration_var.get())
-                    if self.planning_duration_var.get()
-                    else None
-                )
+                duration = _var_float(self.planning_duration_var, None)
             else:
-                mileage = (
-                    float(self.mileage_var.get()) if self.mileage_var.get() else None
-                )
+                mileage = _var_float(self.mileage_var, None)
 
             if graph_type == "Cost Analysis":
                 self.plot_cost_analysis(
@@ -9457,9 +10063,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         )
 
         # Flatten multi-index columns
-        model_stats.columns = [
-            "_".join(col).strip("_") for col in model_stats.columns.values
-        ]
+        _flatten_columns(model_stats)
 
         # Sort by frequency of use
         model_stats = model_stats.sort_values("Total_count", ascending=False).head(10)
@@ -9498,7 +10102,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
 
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_car_categories_analysis(self, df):
         """Show comprehensive analysis of car categories"""
@@ -9538,9 +10142,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         )
 
         # Flatten multi-index columns
-        category_stats.columns = [
-            "_".join(col).strip("_") for col in category_stats.columns.values
-        ]
+        _flatten_columns(category_stats)
 
         # Sort by total spending
         category_stats = category_stats.sort_values("Total_sum", ascending=False)
@@ -9685,10 +10287,11 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
 
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_analysis_placeholder(self):
         """Show placeholder message when no analysis has been run yet"""
+        self._analysis_chart_key = None
         self.analysis_fig.clear()
         self.analysis_ax = self.analysis_fig.add_subplot(111)
         self.analysis_ax.text(
@@ -9703,7 +10306,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         )
         self.analysis_ax.set_title("Data Analysis", fontsize=14)
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def refresh_analysis_data(self):
         """Refresh the analysis data and update the current chart"""
@@ -9728,34 +10331,31 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             messagebox.showwarning("Missing Data", "Date information is missing")
             return
 
-        # Ensure Date column is datetime
-        df_copy = df.copy()
-        if not pd.api.types.is_datetime64_dtype(df_copy["Date"]):
+        # Ensure Date column is datetime (parsed into a local; df itself is not copied)
+        dates = df["Date"]
+        if not pd.api.types.is_datetime64_dtype(dates):
             try:
-                df_copy["Date"] = pd.to_datetime(df_copy["Date"])
+                dates = pd.to_datetime(dates)
             except:
                 messagebox.showwarning("Data Error", "Could not parse dates correctly")
                 return
 
-        # Extract month and year
-        df_copy["Month-Year"] = df_copy["Date"].dt.strftime("%b %Y")
-        df_copy["Month"] = df_copy["Date"].dt.month
-        df_copy["Year"] = df_copy["Date"].dt.year
+        # Month label per trip, formatted once
+        month_year = dates.dt.strftime("%b %Y").rename("Month-Year")
 
         # Get unique month-years in chronological order
-        month_years = df_copy.sort_values("Date")["Month-Year"].unique()
+        month_years = month_year.loc[dates.sort_values().index].unique()
 
         # Group by month-year
         monthly_data = (
-            df_copy.groupby("Month-Year")
+            df[["Total", "Distance (KM)"]]
+            .groupby(month_year)
             .agg({"Total": ["count", "sum"], "Distance (KM)": "sum"})
             .reset_index()
         )
 
         # Flatten multi-index columns
-        monthly_data.columns = [
-            "_".join(col).strip("_") for col in monthly_data.columns.values
-        ]
+        _flatten_columns(monthly_data)
 
         # Calculate average distance per trip
         monthly_data["Avg_Distance"] = (
@@ -9768,8 +10368,8 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
 
         self.add_stat("Period", f"{first_month} to {last_month}")
         self.add_stat("Total Months", f"{len(month_years)}")
-        self.add_stat("Total Trips", f"{df_copy['Total'].count()}")
-        self.add_stat("Total Spending", f"${df_copy['Total'].sum():.2f}")
+        self.add_stat("Total Trips", f"{df['Total'].count()}")
+        self.add_stat("Total Spending", f"${df['Total'].sum():.2f}")
 
         # Reorder for chronological display (ensure month-years are in order)
         monthly_data = (
@@ -9821,7 +10421,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
 
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_fuel_efficiency_analysis(self, df):
         """Show fuel efficiency analysis comparing different car models and providers"""
@@ -9921,7 +10521,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_weekend_weekday_analysis(self, df):
         """Show weekend vs weekday cost and usage patterns"""
@@ -10020,7 +10620,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_distance_cost_analysis(self, df):
         """Show correlation between distance and cost"""
@@ -10094,7 +10694,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_electric_vs_traditional_analysis(self, df):
         """Show comprehensive comparison between electric and traditional vehicles"""
@@ -10111,8 +10711,8 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Get settings for calculations
         try:
-            fuel_price = float(self.fuel_price_var.get()) if hasattr(self, 'fuel_price_var') and self.fuel_price_var.get() else 2.51
-            cost_per_kwh = float(self.cost_per_kwh_var.get()) if hasattr(self, 'cost_per_kwh_var') and self.cost_per_kwh_var.get() else 0.45
+            fuel_price = _var_float(self.fuel_price_var, 2.51)
+            cost_per_kwh = _var_float(self.cost_per_kwh_var, 0.45)
         except:
             fuel_price = 2.51
             cost_per_kwh = 0.45
@@ -10455,7 +11055,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_cost_efficiency_analysis(self, df):
         """Show cost efficiency analysis (cost per km and cost per hour)"""
@@ -10532,7 +11132,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_seasonal_patterns_analysis(self, df):
         """Show quarterly patterns in rental behavior"""
@@ -10658,7 +11258,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def show_usage_patterns_analysis(self, df):
         """Show usage patterns including duration and distance distributions"""
@@ -10718,7 +11318,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         
         # Adjust layout
         self.analysis_fig.tight_layout()
-        self.analysis_canvas.draw()
+        self.analysis_canvas.draw_idle()
 
     def _on_record_region_changed(self, event=None):
         """When record form region changes, update provider list and set first provider."""
@@ -10773,21 +11373,9 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
             if not hasattr(self, 'record_distance_var') or not hasattr(self, 'record_provider_var'):
                 return
             
-            distance = (
-                float(self.record_distance_var.get())
-                if self.record_distance_var.get()
-                else 0
-            )
-            fuel_usage = (
-                float(self.record_fuel_usage_var.get())
-                if self.record_fuel_usage_var.get()
-                else 0
-            )
-            kwh_used = (
-                float(self.record_kwh_used_var.get())
-                if self.record_kwh_used_var.get()
-                else 0
-            )
+            distance = _var_float(self.record_distance_var)
+            fuel_usage = _var_float(self.record_fuel_usage_var)
+            kwh_used = _var_float(self.record_kwh_used_var)
             provider = self.record_provider_var.get()
 
             if distance > 0:
@@ -10798,16 +11386,8 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
                 ev_efficiency = distance / kwh_used if kwh_used > 0 else 0
 
                 # Calculate cost comparison
-                fuel_price = (
-                    float(self.fuel_price_var.get())
-                    if self.fuel_price_var.get()
-                    else 2.51
-                )
-                cost_per_kwh = (
-                    float(self.cost_per_kwh_var.get())
-                    if self.cost_per_kwh_var.get()
-                    else 0.45
-                )
+                fuel_price = _var_float(self.fuel_price_var, 2.51)
+                cost_per_kwh = _var_float(self.cost_per_kwh_var, 0.45)
 
                 ice_cost_per_km = (
                     (fuel_price * fuel_usage) / distance
@@ -10935,47 +11515,21 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         # Prevent recursive calls
         if self._updating_fields:
             return
+        # A direct call already covers the edits a pending scheduled run was for
+        if self._auto_update_after_id is not None:
+            self.root.after_cancel(self._auto_update_after_id)
+            self._auto_update_after_id = None
         self._updating_fields = True
         try:
-            fuel_pumped = (
-                float(self.record_fuel_pumped_var.get())
-                if self.record_fuel_pumped_var.get()
-                else 0
-            )
-            fuel_price = (
-                float(self.fuel_price_var.get()) if self.fuel_price_var.get() else 2.51
-            )
-            distance = (
-                float(self.record_distance_var.get())
-                if self.record_distance_var.get()
-                else 0
-            )
-            total_cost = (
-                float(self.record_total_cost_var.get())
-                if self.record_total_cost_var.get()
-                else 0
-            )
-            duration_cost = (
-                float(self.record_duration_cost_var.get())
-                if self.record_duration_cost_var.get()
-                else 0
-            )
+            fuel_pumped = _var_float(self.record_fuel_pumped_var)
+            fuel_price = _var_float(self.fuel_price_var, 2.51)
+            distance = _var_float(self.record_distance_var)
+            total_cost = _var_float(self.record_total_cost_var)
+            duration_cost = _var_float(self.record_duration_cost_var)
             provider = self.record_provider_var.get()
-            fuel_usage = (
-                float(self.record_fuel_usage_var.get())
-                if self.record_fuel_usage_var.get()
-                else 0
-            )
-            kwh_used = (
-                float(self.record_kwh_used_var.get())
-                if self.record_kwh_used_var.get()
-                else 0
-            )
-            cost_per_kwh = (
-                float(self.cost_per_kwh_var.get())
-                if self.cost_per_kwh_var.get()
-                else 0.45
-            )
+            fuel_usage = _var_float(self.record_fuel_usage_var)
+            kwh_used = _var_float(self.record_kwh_used_var)
+            cost_per_kwh = _var_float(self.cost_per_kwh_var, 0.45)
 
             if provider == "Getgo(EV)":
                 # For EVs, calculate electricity cost and set fuel fields to N/A
@@ -10991,8 +11545,8 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
                 self.record_consumption_var.set("N/A")
                 # Total cost = duration cost + electricity cost
                 if duration_cost or electricity_cost:
-                    total = duration_cost + electricity_cost
-                    self.record_total_cost_var.set(f"{total:.2f}")
+                    total_cost = duration_cost + electricity_cost
+                    self.record_total_cost_var.set(f"{total_cost:.2f}")
             else:
                 # Pumped fuel cost (Esso Singapore 23% discount when toggle on and region Singapore)
                 region = (self.record_region_var.get() or "Singapore").strip()
@@ -11016,7 +11570,12 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
                     f"{mileage_cost:.2f}" if mileage_cost else ""
                 )
 
-                # Cost per KM
+                # Total cost
+                if pumped_fuel_cost or duration_cost or mileage_cost:
+                    total_cost = pumped_fuel_cost + duration_cost + mileage_cost
+                    self.record_total_cost_var.set(f"{total_cost:.2f}")
+
+                # Cost per KM, from the total just calculated so one pass is enough
                 if distance > 0 and total_cost > 0:
                     cost_per_km = total_cost / distance
                     self.record_cost_per_km_var.set(f"{cost_per_km:.2f}")
@@ -11030,11 +11589,6 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
                 else:
                     self.record_consumption_var.set("")
 
-                # Total cost
-                if pumped_fuel_cost or duration_cost or mileage_cost:
-                    total = pumped_fuel_cost + duration_cost + mileage_cost
-                    self.record_total_cost_var.set(f"{total:.2f}")
-
             # Calculate Excel formulas for the current record
             self.calculate_excel_formulas_for_current_record()
 
@@ -11054,6 +11608,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         finally:
             # Always reset the flag, even if an exception occurred
             self._updating_fields = False
+            self._auto_update_inputs = self._record_form_inputs()
 
     # ========== Prediction Tab Methods ==========
     
@@ -11211,8 +11766,7 @@ Tip: Ollama recommendations are personalized based on your user profile and hist
         self.pattern_reasoning_text.config(state=tk.DISABLED)
         
         # Clear and populate table
-        for item in self.pattern_table.get_children():
-            self.pattern_table.delete(item)
+        self.pattern_table.delete(*self.pattern_table.get_children())
         
         # Display daily predictions if available
         daily_predictions = result.get('daily_predictions', [])
@@ -11510,6 +12064,9 @@ def main():
         # Start the main loop
         root.mainloop()
 
+        # Write any settings edits still waiting on the debounce timer
+        app._flush_settings()
+
     except Exception as e:
         print(f"Error starting application: {e}")
         import traceback
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for the chat distance/duration parsing
+"""
+
+import sys
+import os
+
+# Add the current directory to the path so we can import the GUI module
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from car_rental_recommender_gui import (
+    _parse_quantity,
+    _DISTANCE_PATTERN,
+    _DISTANCE_UNITS,
+    _DURATION_PATTERN,
+    _DURATION_UNITS,
+)
+
+
+def parse_distance(text):
+    return _parse_quantity(_DISTANCE_PATTERN, _DISTANCE_UNITS, text, "km")
+
+
+def parse_duration(text):
+    return _parse_quantity(_DURATION_PATTERN, _DURATION_UNITS, text, "hours", bare_whole=True)
+
+
+def test_duration_parsing():
+    """Own-family units win, short spellings need no trailing space"""
+    assert parse_duration("3 hours") == (3.0, "hours", 3.0)
+    assert parse_duration("90 mins") == (90.0, "minutes", 1.5)
+    assert parse_duration("2 days") == (2.0, "days", 48.0)
+    assert parse_duration("4") == (4.0, "hours", 4.0)
+    # Compact forms: a digit may follow a unit
+    assert parse_duration("3h30m") == (3.0, "hours", 3.0)
+    # "m" must not match the start of "miles"
+    assert parse_duration("50 miles for 3 hours") == (3.0, "hours", 3.0)
+    assert parse_duration("25 miles") == (None, None, None)
+
+
+def test_distance_parsing():
+    """km beats miles beats time units; a bare number is km"""
+    assert parse_distance("50 km") == (50.0, "km", 50.0)
+    assert parse_distance("50") == (50.0, "km", 50.0)
+    assert parse_distance("3 hours 50 miles")[:2] == (50.0, "miles")
+    assert parse_distance("rent for 90 mins to go 12 km") == (12.0, "km", 12.0)
+
+
+if __name__ == "__main__":
+    test_duration_parsing()
+    test_distance_parsing()
+    print("✅ Chat parsing tests passed")